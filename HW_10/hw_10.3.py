@@ -1,6 +1,12 @@
+import os
 import sys
 from collections import UserDict
 
+# Реєстр команд спільний з HW_12
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "HW_12"))
+
+from commands import CommandRegistry
+
 
 def input_error(func):
     def inner(*args, **kwargs):
@@ -13,28 +19,37 @@ def input_error(func):
 
 
 contacts = {}
+commands = CommandRegistry(input_error)
+
+
+@commands.command("bye", "close", "exit", exits=True)
+def goodbye():
+    return "Good bye!"
+
 
+@commands.command("hello", "hi", "hallo")
+def hello():
+    return "How can I help you?"
 
-@input_error
-def add_contact(command):
-    _, name, phone = command.split()
+
+@commands.command("add", prompts=("Name: ", "Phone: "), mutates=True)
+def add_contact(name, phone):
     contacts[name] = phone
     return f"Contact '{name}' with phone '{phone}' has been added."
 
 
-@input_error
-def change_phone(command):
-    _, name, phone = command.split()
+@commands.command("change", prompts=("Name: ", "Phone: "), mutates=True)
+def change_phone(name, phone):
     contacts[name] = phone
     return f"Phone number for contact '{name}' has been changed to '{phone}'."
 
 
-@input_error
-def show_phone(command):
-    _, name = command.split()
+@commands.command("phone", prompts=("Name: ",))
+def show_phone(name):
     return f"Phone number for contact '{name}': {contacts[name]}"
 
 
+@commands.command("show all", "show list")
 def show_all_contacts():
     if not contacts:
         return "No contacts found."
@@ -111,27 +126,13 @@ def main():
     address_book = AddressBook()
 
     while True:
-        command = input("> ").lower()
-
-        if command == "bye" or command == "close" or command == "exit":
-            print("Good bye!")
-            break
-        elif command == "hello" or command == "hi" or command == "hallo":
-            print("How can I help you?")
-        elif command.startswith("add"):
-            response = add_contact(command)
-            print(response)
-        elif command.startswith("change"):
-            response = change_phone(command)
-            print(response)
-        elif command.startswith("phone"):
-            response = show_phone(command)
-            print(response)
-        elif command == "show all" or command == "show list":
-            response = show_all_contacts()
-            print(response)
-        else:
+        command, response = commands.dispatch(input("> ").lower(), ask=input)
+        if command is None:
             print("Unknown command. Please try again.")
+            continue
+        print(response)
+        if command.exits:
+            break
 
 
 if __name__ == "__main__":
@@ -2,6 +2,11 @@ from datetime import datetime
 from collections import UserDict
 import json
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "HW_12"))
+
+from search_index import SortedNames, TrigramIndex
 
 class Field:
     def __init__(self, value = None):
@@ -74,33 +79,77 @@ class Record:
         return None
 
 class AddressBook(UserDict):
+    def __init__(self):
+        super().__init__()
+        self.name_index = TrigramIndex()
+        self.phone_index = TrigramIndex()
+        self.sorted_names = SortedNames()
+
     def add_record(self, record):
         self.data[record.name.value] = record
+        self.sorted_names.add(record.name.value)
+        self.index_record(record)
+
+    def index_record(self, record):
+        self.name_index.replace(record.name.value, [record.name.value])
+        self.phone_index.replace(record.name.value, record.show_phones())
+
+    def add_phone(self, name, phone):
+        record = self.data.get(name)
+        if record is None:
+            return False
+        record.add_phone(phone)
+        self.index_record(record)
+        return True
+
+    def edit_phone(self, name, old_phone, new_phone):
+        record = self.data.get(name)
+        if record is None:
+            return False
+        for phone in record.phones:
+            if phone.value == old_phone:
+                phone.value = new_phone
+                self.index_record(record)
+                return True
+        return False
+
+    def delete(self, name):
+        if name not in self.data:
+            return False
+        del self.data[name]
+        self.name_index.remove(name)
+        self.phone_index.remove(name)
+        self.sorted_names.remove(name)
+        return True
 
     def __iter__(self):
-        self._iter_index = 0
-        return self
-
-    def __next__(self):
-        if self._iter_index >= len(self.data):
-            raise StopIteration
-        record = list(self.data.values())[self._iter_index]
-        self._iter_index += 1
-        return record
-
-    def search_by_name(self, name):
-        results = []
-        for record in self.data.values():
-            if name.lower() in record.name.value.lower():
-                results.append(record)
-        return results
-
-    def search_by_phone(self, phone):
-        results = []
-        for record in self.data.values():
-            if any(phone in p.value for p in record.phones):
-                results.append(record)
-        return results
+        # Кожен обхід - окремий генератор, тож кілька обходів не заважають один одному
+        yield from self.data.values()
+
+    def page(self, size, cursor=None):
+        # (до size записів за порядком імен, курсор наступної сторінки або None)
+        if self.sorted_names.names is None:
+            self.sorted_names.build(self.data)
+        names = self.sorted_names.after(cursor, size + 1)
+        if len(names) > size:
+            return [self.data[name] for name in names[:size]], names[size - 1]
+        return [self.data[name] for name in names], None
+
+    def iterator(self, n):
+        # Генератор сторінок по n записів; обхід можна зупинити будь-коли
+        cursor = None
+        while True:
+            records, cursor = self.page(n, cursor)
+            if records:
+                yield records
+            if cursor is None:
+                return
+
+    def search_by_name(self, name, limit=None, offset=0):
+        return [self.data[key] for key in self.name_index.search(name, limit, offset)]
+
+    def search_by_phone(self, phone, limit=None, offset=0):
+        return [self.data[key] for key in self.phone_index.search(phone, limit, offset)]
 
 def save_address_book(address_book, filename):
     data = {
@@ -171,11 +220,8 @@ if __name__ == "__main__":
                     print(f"Current phone(s):")
                     phone_to_edit = input("Введи номер для зміни: ")
                     new_phone = input("Введи новий номер: ")
-                    for phone in record.phones:
-                        if phone.value == phone_to_edit:
-                            phone.value = new_phone
-                            print("Номер змінено.")
-                            break
+                    if book.edit_phone(name, phone_to_edit, new_phone):
+                        print("Номер змінено.")
                     else:
                         print("Номер не знайдений.")
                 else:
@@ -191,7 +237,7 @@ if __name__ == "__main__":
             else:
                 print("Контакт не знайдений.")
         elif command == "show all":
-            for record in book.data.values():
+            for record in book:
                 print(f"Імʼя: {record.name.value}, Телефон: {record.show_phones()}")
                 if hasattr(record, 'birthday'):
                     print(f"Днів до дня народження: {record.days_to_birthday()} днів")
@@ -223,8 +269,7 @@ if __name__ == "__main__":
 
         elif command == "delete":
             name = input("Введи імʼя до видалення: ")
-            if name.lower() in book.data:
-                del book.data[name.lower()]
+            if book.delete(name.lower()):
                 print(f"Контакт '{name}' видалений.")
             else:
                 print(f"Контакт '{name}' не знайдений.")
@@ -0,0 +1,665 @@
+from datetime import date, datetime
+from collections import UserDict
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from functools import wraps
+import gc
+import json
+import threading
+
+from birthday_index import BirthdayIndex, bucket_date, celebration_days, next_birthday, upcoming, week_digest
+from contacts_io import Progress, RejectFile, read_contacts, write_contacts
+from search_index import SortedNames, TrigramIndex
+from storage import JSONStorage, open_storage
+
+class Field:
+    # Значення зберігається в єдиному слоті _value, без __dict__ на кожен об'єкт.
+    # Підкласи перевіряють і пакують значення в сеттері value.
+    __slots__ = ("_value",)
+
+    def __init__(self, value = None):
+        self.value = value
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
+
+    @classmethod
+    def packed(cls, packed):
+        # Поле з уже перевіреного упакованого значення (з Record), без повторної перевірки
+        field = cls.__new__(cls)
+        field._value = packed
+        return field
+
+    def __str__(self):
+        return self.value
+
+    def __repr__(self):
+        return self.value
+
+    def __json_encode__(self):
+        return self.value
+
+    @classmethod
+    def __json_decode__(cls, value):
+        return cls(value)
+
+class CustomJSONEncoder(json.JSONEncoder):
+    def default(self, obj):
+        if isinstance(obj, datetime):
+            return obj.strftime('%Y-%m-%d')
+        elif isinstance(obj, Name):
+            return obj.value
+        return super().default(obj)
+
+
+
+class Phone(Field):
+    # Номер зберігається як ціле число, рядок із 10 цифр відновлюється при читанні
+    __slots__ = ()
+
+    @property
+    def value(self):
+        return f"{self._value:010d}"
+
+    @value.setter
+    def value(self, value):
+        if len(value) == 10 and value.isdigit():
+            self._value = int(value)
+        else:
+            raise ValueError("Невірний номер")
+
+class Birthday(Field):
+    # Дата зберігається як порядковий номер дня (date.toordinal)
+    __slots__ = ()
+
+    @property
+    def value(self):
+        return self.date.isoformat()
+
+    @value.setter
+    def value(self, value):
+        try:
+            self._value = datetime.strptime(value, "%Y-%m-%d").toordinal()
+        except ValueError:
+            raise ValueError("Невірний формат дати народження. Введи YYYY-MM-DD")
+
+    @property
+    def date(self):
+        return date.fromordinal(self._value)
+
+class Name(Field):
+    __slots__ = ()
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        if not value:
+            raise ValueError("Поле з імʼям не може бути пустим")
+        self._value = value
+
+
+class Record:
+    # Компактний запис: ім'я - рядок, телефон - ціле число (кілька телефонів -
+    # кортеж цілих), дата народження - порядковий номер дня. Name, Phone і Birthday перевіряють значення на вході,
+    # а назовні (name, phones, birthday) створюються на вимогу з упакованих значень.
+    # Змінювати запис слід методами (add_phone, edit_phone, ...), а не через ці об'єкти.
+    __slots__ = ("_name", "_phones", "_birthday")
+
+    def __init__(self, name, phone):
+        self._name = Name(name).value
+        self._phones = Phone(phone)._value
+        self._birthday = None
+
+    def numbers(self):
+        return self._phones if isinstance(self._phones, tuple) else (self._phones,)
+
+    def set_numbers(self, numbers):
+        self._phones = numbers[0] if len(numbers) == 1 else tuple(numbers)
+
+    @property
+    def name(self):
+        return Name.packed(self._name)
+
+    @property
+    def phones(self):
+        return [Phone.packed(number) for number in self.numbers()]
+
+    @property
+    def birthday(self):
+        if self._birthday is None:
+            return None
+        return Birthday.packed(self._birthday)
+
+    @birthday.setter
+    def birthday(self, birthday):
+        self._birthday = None if birthday is None else birthday._value
+
+
+    def __json_encode__(self):
+        data = {
+            "name": self._name,
+            "phones": self.show_phones(),
+            "birthday": None if self._birthday is None else date.fromordinal(self._birthday).isoformat()
+        }
+        return data
+
+
+
+    @classmethod
+    def from_packed(cls, name, numbers, birthday):
+        # Запис із уже перевірених упакованих значень (див. parse_contact)
+        record = cls.__new__(cls)
+        record._name = name
+        record.set_numbers(numbers)
+        record._birthday = birthday
+        return record
+
+    def to_packed(self):
+        # Упаковані значення для знімка, зворотне до from_packed
+        return [self._name, list(self.numbers()), self._birthday]
+
+    @classmethod
+    def __json_decode__(cls, data):
+        record = cls(data["name"], data["phones"][0])
+        record.birthday = Birthday.__json_decode__(data.get("birthday")) if data.get("birthday") else None
+        for phone_data in data.get("phones")[1:]:
+            record.add_phone(phone_data)
+        return record
+
+    def add_phone(self, phone):
+        self.set_numbers(self.numbers() + (Phone(phone)._value,))
+
+    def remove_phone(self, phone):
+        self.set_numbers([number for number in self.numbers() if f"{number:010d}" != phone])
+
+    def edit_phone(self, old_phone, new_phone):
+        new_number = Phone(new_phone)._value
+        phones = self.show_phones()
+        if old_phone not in phones:
+            return False
+        numbers = list(self.numbers())
+        numbers[phones.index(old_phone)] = new_number
+        self.set_numbers(numbers)
+        return True
+
+    def edit_birthday(self, new_birthday):
+        try:
+            self.birthday = Birthday(new_birthday)
+        except ValueError:
+            print("Невірний формат дати народження. Введи YYYY-MM-DD")
+
+    def show_phones(self):
+        return [f"{number:010d}" for number in self.numbers()]
+
+    def days_to_birthday(self):
+        if self._birthday is not None:
+            today = datetime.today().date()
+            days_left = (next_birthday(date.fromordinal(self._birthday), today) - today).days
+            return days_left
+        else:
+            return None
+
+
+class StorageContacts(MutableMapping):
+    # book.data для лінивого сховища: записи читаються з бази при першому зверненні
+    # і кешуються, тож старт не завантажує всю книгу. Запис у сховище робить
+    # AddressBook (save_record/delete), а не присвоєння в словник.
+    def __init__(self, storage):
+        self.storage = storage
+        self.cache = {}
+
+    def __getitem__(self, name):
+        if name not in self.cache:
+            contact = self.storage.get(name)
+            if contact is None:
+                raise KeyError(name)
+            self.cache[name] = Record.__json_decode__(contact)
+        record = self.cache[name]
+        if record is None:
+            raise KeyError(name)
+        return record
+
+    def __setitem__(self, name, record):
+        self.cache[name] = record
+
+    def __delitem__(self, name):
+        # None - видалений: у пакеті рядок ще в базі до commit_batch
+        self.cache[name] = None
+
+    def __iter__(self):
+        return self.storage.names()
+
+    def __len__(self):
+        return self.storage.count()
+
+    def values(self, after=None, limit=None):
+        # Записи за порядком імен, без кешування - обхід великої книги не тримає її в пам'яті
+        for contact in self.storage.contacts(after, limit):
+            if contact["name"] not in self.cache:
+                yield Record.__json_decode__(contact)
+            elif self.cache[contact["name"]] is not None:
+                yield self.cache[contact["name"]]
+
+
+def locked(method):
+    # Зміна книги - під book.lock, щоб фонове збереження бачило цілісний стан
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+@contextmanager
+def gc_paused():
+    # Циклічний збирач сміття на час масового створення записів: інакше він раз у раз
+    # обходить усю книгу, що росте. Записи не утворюють циклів, тож сміття не накопичується
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def name_texts(name):
+    return (name.lower(),)
+
+
+def phone_texts(numbers):
+    # Упаковані номери запису (ціле або кортеж цілих) -> рядки з 10 цифр
+    return [f"{number:010d}" for number in (numbers if isinstance(numbers, tuple) else (numbers,))]
+
+
+class AddressBook(UserDict):
+    def __init__(self, storage=None):
+        super().__init__()
+        self.storage = storage
+        # Пошукові індекси для книги в пам'яті; лінивому сховищу шукає сама база.
+        # Після великого пакета індекси скидаються і будуються заново при першому запиті
+        self.name_index = TrigramIndex(name_texts)
+        self.phone_index = TrigramIndex(phone_texts)
+        self.birthday_index = BirthdayIndex()
+        self.indexed = True
+        self.sorted_names = SortedNames()
+        # Відкладені зміни всередині batch(): ім'я -> (запис або None, якщо видалений,
+        # чи записувати в сховище)
+        self.batch_depth = 0
+        self.pending = {}
+        # Незбережені зміни: лише зміни їх рахують, on_change(кількість) - сповіщення
+        # для фонового збереження (Flusher); lock - спільний зі збереженням
+        self.changes = 0
+        self.on_change = None
+        self.lock = threading.RLock()
+        if storage is not None and storage.lazy:
+            self.data = StorageContacts(storage)
+
+    @locked
+    def add_record(self, record):
+        self.load_record(record)
+        self.save_record(record)
+
+    @locked
+    def load_record(self, record):
+        # Запис у книгу та індекси без запису в сховище (завантаження)
+        self.data[record.name.value] = record
+        self.index_record(record)
+
+    def index_record(self, record):
+        if self.batch_depth:
+            name = record.name.value
+            self.pending[name] = (record, name in self.pending and self.pending[name][1])
+            return
+        self.index_records([record])
+
+    def index_records(self, records):
+        # (ім'я, запис) для кожного - ім'я береться один раз, а не в кожному індексі
+        named = [(record._name, record) for record in records]
+        for name, record in named:
+            self.sorted_names.add(name)
+        if isinstance(self.data, StorageContacts) or not self.indexed:
+            return
+        # Індекси тримають ім'я й упаковані номери самого запису, а не рядки-копії
+        self.name_index.add_many((name, name) for name, record in named)
+        self.phone_index.add_many((name, record._phones) for name, record in named)
+        for name, record in named:
+            birthday = record.birthday
+            if birthday is None:
+                self.birthday_index.remove(name)
+            else:
+                self.birthday_index.add(name, birthday.date)
+
+    def save_record(self, record):
+        # Запис змінився - у сховище йде лише він
+        if self.batch_depth:
+            self.pending[record.name.value] = (record, True)
+        else:
+            if self.storage is not None:
+                self.storage.put(record.__json_encode__())
+            self.mark_changed()
+
+    def mark_changed(self, count=1):
+        self.changes += count
+        if self.on_change is not None:
+            self.on_change(self.changes)
+
+    @locked
+    def add_phone(self, name, phone):
+        record = self.data.get(name)
+        if record is None:
+            return False
+        record.add_phone(phone)
+        self.index_record(record)
+        self.save_record(record)
+        return True
+
+    @locked
+    def edit_phone(self, name, old_phone, new_phone):
+        record = self.data.get(name)
+        if record is None or not record.edit_phone(old_phone, new_phone):
+            return False
+        self.index_record(record)
+        self.save_record(record)
+        return True
+
+    @locked
+    def set_birthday(self, name, birthday):
+        record = self.data.get(name)
+        if record is None:
+            return False
+        record.birthday = Birthday(birthday)
+        self.index_record(record)
+        self.save_record(record)
+        return True
+
+    @locked
+    def delete(self, name):
+        if name not in self.data:
+            return False
+        del self.data[name]
+        if self.batch_depth:
+            self.pending[name] = (None, True)
+            return True
+        self.unindex(name)
+        if self.storage is not None:
+            self.storage.delete(name)
+        self.mark_changed()
+        return True
+
+    def unindex(self, name):
+        self.sorted_names.remove(name)
+        if self.indexed:
+            self.name_index.remove(name)
+            self.phone_index.remove(name)
+            self.birthday_index.remove(name)
+
+    def drop_indexes(self):
+        self.name_index = TrigramIndex(name_texts)
+        self.phone_index = TrigramIndex(phone_texts)
+        self.birthday_index = BirthdayIndex()
+        self.indexed = False
+        self.sorted_names.names = None
+
+    def ensure_indexes(self):
+        if not self.indexed and not isinstance(self.data, StorageContacts):
+            self.indexed = True
+            self.index_records(self.data.values())
+
+    @contextmanager
+    def batch(self):
+        # Пакет змін: індекси й сховище оновлюються один раз при виході з блоку,
+        # для кожного зміненого запису - одна операція, скільки б разів він не змінювався.
+        # Відкату немає: при винятку вже зроблені зміни теж фіксуються
+        with self.lock, gc_paused():
+            self.batch_depth += 1
+            try:
+                yield self
+            finally:
+                self.batch_depth -= 1
+                if not self.batch_depth:
+                    self.commit_batch()
+
+    def commit_batch(self):
+        pending, self.pending = self.pending, {}
+        if len(pending) > 1000:
+            # Великий пакет: індекси будуються заново при першому запиті, а не тут,
+            # тож імпорт і завантаження обмежені швидкістю розбору файлу
+            self.drop_indexes()
+        records, puts, deletes = [], [], []
+        for name, (record, save) in pending.items():
+            if record is None:
+                self.unindex(name)
+                if save:
+                    deletes.append(name)
+            else:
+                records.append(record)
+                if save:
+                    puts.append(record)
+        self.index_records(records)
+        if self.storage is not None:
+            # Генератор: сховище, якому окремі записи не потрібні (JSON), не платить за кодування
+            self.storage.put_many(record.__json_encode__() for record in puts)
+            for name in deletes:
+                self.storage.delete(name)
+        if puts or deletes:
+            self.mark_changed(len(puts) + len(deletes))
+
+    @locked
+    def bulk_add(self, rows, on_error=None, save=True):
+        # rows - пари (номер рядка, словник контакту). Контакти перевіряються parse_contact
+        # без проміжних Name/Phone/Birthday і додаються одним пакетом.
+        # Повертає (кількість доданих, помилки [(номер, текст)]); якщо передано
+        # on_error(номер, контакт, текст), помилки йдуть туди, а список порожній
+        added = 0
+        errors = []
+        with self.batch():
+            for row, contact_data in rows:
+                try:
+                    record = parse_contact(contact_data)
+                except (ValueError, TypeError) as e:
+                    if on_error is None:
+                        errors.append((row, str(e)))
+                    else:
+                        on_error(row, contact_data, str(e))
+                    continue
+                # Те саме, що add_record/load_record у пакеті, без зайвих викликів на запис
+                self.data[contact_data["name"]] = record
+                self.pending[contact_data["name"]] = (record, save)
+                added += 1
+        return added, errors
+
+    def birthdays_on(self, day):
+        # Імена іменинників, що святкують у дату day
+        if isinstance(self.data, StorageContacts):
+            return self.storage.birthdays_on([bucket_date(bucket).strftime("%m-%d") for bucket in celebration_days(day)])
+        self.ensure_indexes()
+        return self.birthday_index.names_on(day)
+
+    def upcoming_birthdays(self, days, start=None):
+        # [(дата, [імена])] на days днів уперед, включно з start (сьогодні за замовчуванням)
+        return upcoming(self.birthdays_on, start or datetime.today().date(), days)
+
+    def birthdays_per_week(self, start=None):
+        # Тиждень від start з перенесенням вихідних на понеділок, як get_birthdays_per_week
+        return week_digest(self.birthdays_on, start or datetime.today().date())
+
+    @locked
+    def load_packed(self, rows):
+        # Упаковані записи зі знімка: значення перевірені при збереженні, а цілісність
+        # файлу - контрольною сумою, тож записи створюються без parse_contact
+        progress = Progress("Завантажено контактів")
+        with self.batch():
+            for name, numbers, birthday in progress.track(rows):
+                record = Record.from_packed(name, numbers, birthday)
+                self.data[name] = record
+                self.pending[name] = (record, False)
+        progress.finish()
+        return progress.count
+
+    def packed(self):
+        # Записи для знімка; книга в SQLite віддає словники, знімок їх упакує сам
+        if isinstance(self.data, StorageContacts):
+            return self.storage.contacts()
+        return (record.to_packed() for record in self.data.values())
+
+    def contacts(self):
+        # Контакти у вигляді словників для збереження
+        if isinstance(self.data, StorageContacts):
+            return self.storage.contacts()
+        return (record.__json_encode__() for record in self.data.values())
+
+    def __iter__(self):
+        # Кожен обхід - окремий генератор, тож кілька обходів не заважають один одному
+        yield from self.data.values()
+
+    def page(self, size, cursor=None):
+        # (до size записів за порядком імен, курсор наступної сторінки або None).
+        # Курсор - ім'я останнього запису, тож сторінки стабільні при додаванні/видаленні
+        if isinstance(self.data, StorageContacts):
+            records = list(self.data.values(cursor, size + 1))
+        else:
+            if self.sorted_names.names is None:
+                self.sorted_names.build(self.data)
+            records = [self.data[name] for name in self.sorted_names.after(cursor, size + 1)]
+        if len(records) > size:
+            return records[:size], records[size - 1].name.value
+        return records, None
+
+    def iterator(self, n):
+        # Генератор сторінок по n записів; обхід можна зупинити будь-коли
+        cursor = None
+        while True:
+            records, cursor = self.page(n, cursor)
+            if records:
+                yield records
+            if cursor is None:
+                return
+
+    def search_by_name(self, name, limit=None, offset=0):
+        # Результати відсортовані за іменем; limit/offset - сторінка результатів
+        if isinstance(self.data, StorageContacts):
+            found = self.storage.search_name(name, limit, offset)
+        else:
+            self.ensure_indexes()
+            found = self.name_index.search(name, limit, offset)
+        return [self.data[key] for key in found]
+
+    def search_by_phone(self, phone, limit=None, offset=0):
+        if isinstance(self.data, StorageContacts):
+            found = self.storage.search_phone(phone, limit, offset)
+        else:
+            self.ensure_indexes()
+            found = self.phone_index.search(phone, limit, offset)
+        return [self.data[key] for key in found]
+
+    def __json_encode__(self):
+        data = {
+            "contacts": list(self.contacts())
+        }
+        return data
+
+    @classmethod
+    def __json_decode__(cls, data):
+        address_book = cls()
+        for contact_data in data.get("contacts", []):
+            address_book.add_record(Record.__json_decode__(contact_data))
+        return address_book
+
+def save_address_book(address_book, filename):
+    storage = address_book.storage if address_book.storage is not None else JSONStorage(filename)
+    storage.flush(address_book)
+
+
+
+def parse_contact(contact_data):
+    # Record зі словника контакту за тими ж правилами, що й сеттери Name, Phone і Birthday,
+    # але без створення проміжних об'єктів; ValueError, якщо дані недійсні
+    if not isinstance(contact_data, dict) or not contact_data.get("name") or not contact_data.get("phones"):
+        raise ValueError("Недійсні дані контакту")
+    numbers = []
+    for phone in contact_data["phones"]:
+        if len(phone) == 10 and phone.isdigit():
+            numbers.append(int(phone))
+        else:
+            raise ValueError("Невірний номер")
+    birthday = contact_data.get("birthday")
+    if not birthday:
+        birthday = None
+    elif len(birthday) == 10 and birthday.isascii() and birthday[4] == birthday[7] == "-" \
+            and birthday[:4].isdigit() and birthday[5:7].isdigit() and birthday[8:].isdigit():
+        # YYYY-MM-DD з ASCII-цифрами: date.fromisoformat приймає те саме, що strptime, але швидше
+        try:
+            birthday = date.fromisoformat(birthday).toordinal()
+        except ValueError:
+            raise ValueError("Невірний формат дати народження. Введи YYYY-MM-DD")
+    else:
+        birthday = Birthday(birthday)._value
+    return Record.from_packed(contact_data["name"], numbers, birthday)
+
+
+def fill_address_book(address_book, rows, rejects, label, save):
+    # rows - (номер, контакт); недійсні контакти йдуть у файл відхилених, а не в консоль
+    progress = Progress(label)
+    added, errors = address_book.bulk_add(progress.track(rows), rejects.write, save)
+    progress.finish()
+    rejects.close()
+    if rejects.count:
+        print(f"Недійсних контактів: {rejects.count}, див. '{rejects.path}'")
+    return added
+
+
+def load_address_book(filename, storage=None):
+    # .db/.sqlite - SQLite, записи читаються на вимогу; інакше - знімок або JSON/JSON Lines
+    # потоково (знімок розпізнається за вмістом).
+    # Інше сховище (напр. JournalStorage) можна передати явно.
+    if storage is None:
+        storage = open_storage(filename)
+    address_book = AddressBook(storage)
+    if storage.lazy:
+        return address_book
+
+    try:
+        packed = storage.load_packed()
+        if packed is not None:
+            address_book.load_packed(packed)
+        else:
+            fill_address_book(address_book, storage.load(), RejectFile(filename + ".rejects.jsonl"), "Завантажено контактів", save=False)
+    except json.JSONDecodeError as e:
+        print(f"Невірний JSON у файлі '{filename}': {e}")
+        set_aside(storage)
+    except ValueError as e:
+        # Контрольна сума, формат або версія знімка
+        print(f"Не вдалося прочитати '{filename}': {e}")
+        set_aside(storage)
+    return address_book
+
+
+def set_aside(storage):
+    # Пошкоджений файл перейменовується до першого збереження, тож Flusher чи пакетний
+    # режим пишуть новий файл, а не поверх нього. Якщо перейменувати не вдалося -
+    # OSError зупиняє програму, перш ніж щось буде збережено
+    for path in storage.set_aside():
+        print(f"Пошкоджений файл відкладено як '{path}', книга збережеться в новий файл.")
+
+
+def import_contacts(address_book, path, rejects_path=None):
+    # Додає контакти з .json, .jsonl або .csv одним пакетом; повертає кількість доданих
+    rejects = RejectFile(rejects_path or path + ".rejects.jsonl")
+    return fill_address_book(address_book, read_contacts(path), rejects, "Імпортовано контактів", save=True)
+
+
+def export_contacts(address_book, path):
+    # Повертає кількість записаних контактів
+    progress = Progress("Експортовано контактів")
+    count = write_contacts(path, address_book.contacts(), progress)
+    progress.finish()
+    return count
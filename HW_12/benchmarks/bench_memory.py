@@ -0,0 +1,106 @@
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tracemalloc
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from address_book import AddressBook, Record
+
+
+# Попереднє представлення запису (об'єкти з __dict__, рядки) - для порівняння пам'яті
+class LegacyField:
+    def __init__(self, value = None):
+        self.value = value
+
+
+class LegacyRecord:
+    def __init__(self, name, phone):
+        self.name = LegacyField(name)
+        self.phones = [LegacyField(phone)]
+        self.birthday = None
+
+    def add_phone(self, phone):
+        self.phones.append(LegacyField(phone))
+
+    def edit_birthday(self, new_birthday):
+        datetime.strptime(new_birthday, "%Y-%m-%d")
+        self.birthday = LegacyField(new_birthday)
+
+
+def make_contacts(count, seed):
+    # Рядки JSON, по одному на контакт, як у файлі книги
+    rng = random.Random(seed)
+    lines = []
+    for index in range(count):
+        phones = [f"{rng.randrange(10 ** 10):010d}" for _ in range(rng.choice((1, 1, 1, 2)))]
+        birthday = f"{rng.randint(1950, 2010)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        lines.append(json.dumps([f"contact{index}", phones, birthday]))
+    return lines
+
+
+def measure(record_class, lines):
+    # Рядки розбираються під час заміру: книга тримає лише те, що зберіг запис
+    gc.collect()
+    tracemalloc.start()
+    records = []
+    for line in lines:
+        name, phones, birthday = json.loads(line)
+        record = record_class(name, phones[0])
+        for phone in phones[1:]:
+            record.add_phone(phone)
+        record.edit_birthday(birthday)
+        records.append(record)
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return used / len(lines)
+
+
+def measure_book(lines):
+    # Книга як у програмі: завантажена зі знімка (load_packed) і з індексами пошуку,
+    # які будуються при першому пошуку; рахується все, що тримає AddressBook
+    gc.collect()
+    tracemalloc.start()
+    book = AddressBook()
+
+    def rows():
+        for line in lines:
+            name, phones, birthday = json.loads(line)
+            yield name, [int(phone) for phone in phones], date.fromisoformat(birthday).toordinal()
+
+    book.load_packed(rows())
+    loaded = tracemalloc.get_traced_memory()[0]
+    book.search_by_name("contact1")
+    book.search_by_phone("123")
+    book.birthdays_on(date.today())
+    indexed = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return loaded / len(lines), indexed / len(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пам'ять на контакт: попередній Record проти компактного і книги з індексами.")
+    parser.add_argument("--count", type=int, default=500_000, help="кількість контактів")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    lines = make_contacts(args.count, args.seed)
+    legacy_bytes = measure(LegacyRecord, lines)
+    compact_bytes = measure(Record, lines)
+    book_bytes, indexed_bytes = measure_book(lines)
+
+    print(f"contacts: {args.count}")
+    print(f"legacy Record:  {legacy_bytes:8.1f} B/contact")
+    print(f"compact Record: {compact_bytes:8.1f} B/contact  x{legacy_bytes / compact_bytes:.1f} less memory")
+    # Попередня книга - словник записів без індексів (пошук перебором), тож з нею
+    # порівнюється книга до першого пошуку; індекси - ціна пошуку без перебору
+    print(f"AddressBook:    {book_bytes:8.1f} B/contact  x{legacy_bytes / book_bytes:.1f} less memory")
+    print(f"  + indexes:    {indexed_bytes:8.1f} B/contact  (trigram name/phone and birthday indexes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from address_book import AddressBook, load_address_book, save_address_book
+
+
+# Розмір файлу і час збереження/завантаження: address_book.json проти знімка .abk
+def make_book(count, seed):
+    rng = random.Random(seed)
+    book = AddressBook()
+    rows = []
+    for index in range(count):
+        phones = [f"{rng.randrange(10 ** 10):010d}" for _ in range(rng.choice((1, 1, 1, 2)))]
+        birthday = f"{rng.randint(1950, 2010)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        rows.append((index, {"name": f"contact{index}", "phones": phones, "birthday": birthday}))
+    book.bulk_add(rows, save=False)
+    return book
+
+
+def measure(book, path):
+    start = time.perf_counter()
+    save_address_book(book, path)
+    saved = time.perf_counter() - start
+    start = time.perf_counter()
+    loaded = load_address_book(path)
+    load_time = time.perf_counter() - start
+    assert len(loaded) == len(book)
+    return os.path.getsize(path), saved, load_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Знімок .abk проти address_book.json.")
+    parser.add_argument("--count", type=int, default=200_000, help="кількість контактів")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    book = make_book(args.count, args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        json_size, json_save, json_load = measure(book, os.path.join(directory, "book.json"))
+        abk_size, abk_save, abk_load = measure(book, os.path.join(directory, "book.abk"))
+
+    print(f"contacts: {args.count}")
+    print(f"json: {json_size / 1024:9.0f} KiB  save {json_save:6.2f} s  load {json_load:6.2f} s")
+    print(f"abk:  {abk_size / 1024:9.0f} KiB  save {abk_save:6.2f} s  load {abk_load:6.2f} s"
+          f"  x{json_size / abk_size:.1f} smaller, x{json_load / abk_load:.1f} faster load")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+from datetime import date, timedelta
+
+
+# День року рахується за високосним 2000 роком: 366 кошиків, 29 лютого - окремий кошик.
+# У невисокосні роки день народження 29 лютого святкується 1 березня.
+LEAP_YEAR = 2000
+FEB_29 = date(LEAP_YEAR, 2, 29).timetuple().tm_yday - 1
+
+
+def day_of_year(month, day):
+    return date(LEAP_YEAR, month, day).timetuple().tm_yday - 1
+
+
+def bucket_date(bucket):
+    return date(LEAP_YEAR, 1, 1) + timedelta(days=bucket)
+
+
+def is_leap(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def celebration_days(day):
+    # Номери кошиків, чиї іменинники святкують у дату day
+    days = [day_of_year(day.month, day.day)]
+    if day.month == 3 and day.day == 1 and not is_leap(day.year):
+        days.append(FEB_29)
+    return days
+
+
+def next_birthday(birthday, today):
+    # Найближча дата святкування, не раніше today
+    for year in (today.year, today.year + 1):
+        if birthday.month == 2 and birthday.day == 29 and not is_leap(year):
+            celebration = date(year, 3, 1)
+        else:
+            celebration = date(year, birthday.month, birthday.day)
+        if celebration >= today:
+            return celebration
+
+
+class BirthdayIndex:
+    # Кошик на кожен день року -> множина ключів (імен контактів)
+    def __init__(self):
+        self.buckets = [set() for _ in range(366)]
+        self.days = {} #ключ -> номер кошика
+
+    def add(self, key, birthday):
+        self.remove(key)
+        day = day_of_year(birthday.month, birthday.day)
+        self.buckets[day].add(key)
+        self.days[key] = day
+
+    def remove(self, key):
+        day = self.days.pop(key, None)
+        if day is not None:
+            self.buckets[day].discard(key)
+
+    def names_on(self, day):
+        names = []
+        for bucket in celebration_days(day):
+            names.extend(self.buckets[bucket])
+        return sorted(names)
+
+
+def upcoming(names_on, start, days):
+    # [(дата, [імена])] для днів з іменинниками в [start, start + days); O(days + результат)
+    result = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        names = names_on(day)
+        if names:
+            result.append((day, names))
+    return result
+
+
+def week_digest(names_on, start, days=7):
+    # Як get_birthdays_per_week з HomeWork_8: іменинники вихідних (субота, неділя)
+    # переносяться на наступний понеділок. {дата привітання: [імена]} за порядком дат
+    digest = {}
+    for day, names in upcoming(names_on, start, days):
+        if day.weekday() >= 5:
+            day = day + timedelta(days=7 - day.weekday())
+        digest.setdefault(day, []).extend(names)
+    return digest
@@ -0,0 +1,128 @@
+from datetime import datetime
+
+from address_book import Record, export_contacts, import_contacts
+from commands import CommandRegistry
+
+
+# Команди адресної книги для REPL (12.6.py), пакетного режиму і сервера.
+# Кожен обробник отримує книгу першим аргументом і повертає текст відповіді.
+def input_error(func):
+    def inner(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except (KeyError, ValueError, IndexError) as e:
+            return str(e.args[0]) if e.args else "Невірні дані."
+
+    return inner
+
+
+commands = CommandRegistry(input_error)
+
+
+def describe(record):
+    lines = [f"Імʼя: {record.name.value}, Телефон: {record.show_phones()}"]
+    if record.birthday is not None:
+        lines.append(f"Днів до дня народження: {record.days_to_birthday()} днів")
+    else:
+        lines.append("Днів до дня народження: Немає дати")
+    lines.append("-" * 20)
+    return "\n".join(lines)
+
+
+@commands.command("bye", "good bye", "exit", "бувай", "до побачення", exits=True)
+def goodbye(book):
+    return "До побачення,повертайся!"
+
+
+@commands.command("hi", "hello", "привіт")
+def hello(book):
+    return "Вітаю,друже!"
+
+
+@commands.command("add", "додати", prompts=("Введи Імʼя: ", "Введи номер телефону(10цифр): "), mutates=True)
+def add(book, name, phone):
+    name = name.lower()
+    if not phone.isdigit() or len(phone) != 10:
+        return "Цей номер не є дійсний.Введи 10 цифр."
+    if name in book.data:
+        return "Контакт з цим імʼям вже створений!"
+    book.add_record(Record(name, phone))
+    return "Контакт доданий."
+
+
+@commands.command("add_birthday", prompts=("Введи імʼя: ", "Введи дату народження (YYYY-MM-DD): "), mutates=True)
+def add_birthday(book, name, birthday):
+    if name.lower() not in book.data:
+        return "Контакт з таким іменем ще не доданий."
+    try:
+        datetime.strptime(birthday, "%Y-%m-%d")
+    except ValueError:
+        return "Невірний формат дати. Використовуйте YYYY-MM-DD."
+    book.set_birthday(name.lower(), birthday)
+    return "Дата народження додана."
+
+
+@commands.command("edit_phone", prompts=("Введи імʼя: ", "Введи номер для зміни: ", "Введи новий номер: "), mutates=True)
+def edit_phone(book, name, old_phone, new_phone):
+    if book.get(name.lower()) is None:
+        return f"Контакт '{name}' не знайдено."
+    if book.edit_phone(name.lower(), old_phone, new_phone):
+        return "Номер змінено."
+    return "Номер не знайдений."
+
+
+@commands.command("show all")
+def show_all(book):
+    return "\n".join(describe(record) for record in book)
+
+
+@commands.command("search name", prompts=("Введи частину імені для пошуку: ",))
+def search_name(book, query):
+    search_results = book.search_by_name(query.lower())
+    if not search_results:
+        return "Контакт не знайдений."
+    return "\n".join(["Результат пошуку:"] + [describe(result) for result in search_results])
+
+
+@commands.command("search phone", prompts=("Введи частину номера для пошуку: ",))
+def search_phone(book, query):
+    search_results = book.search_by_phone(query)
+    if not search_results:
+        return "Контакт не знайдений."
+    return "\n".join(["Результат пошуку:"] + [describe(result) for result in search_results])
+
+
+@commands.command("birthdays")
+def birthdays(book):
+    # Іменинники на тиждень уперед, вихідні переносяться на понеділок
+    return "\n".join(f"{day.strftime('%A')} ({day}): {', '.join(names)}" for day, names in book.birthdays_per_week().items())
+
+
+@commands.command("upcoming birthdays", prompts=("Введи кількість днів: ",))
+def upcoming_birthdays(book, days):
+    if not days.isdigit():
+        return "Введи ціле число днів."
+    return "\n".join(f"{day}: {', '.join(names)}" for day, names in book.upcoming_birthdays(int(days)))
+
+
+@commands.command("import", prompts=("Введи файл для імпорту (.json, .jsonl, .csv або .abk): ",), mutates=True)
+def import_file(book, path):
+    try:
+        return f"Додано контактів: {import_contacts(book, path)}"
+    except (OSError, ValueError) as e:
+        return f"Помилка імпорту: {e}"
+
+
+@commands.command("export", prompts=("Введи файл для експорту (.json, .jsonl, .csv або .abk): ",))
+def export_file(book, path):
+    try:
+        return f"Експортовано контактів: {export_contacts(book, path)}"
+    except OSError as e:
+        return f"Помилка експорту: {e}"
+
+
+@commands.command("delete", prompts=("Введи імʼя до видалення: ",), mutates=True)
+def delete(book, name):
+    if book.delete(name.lower()):
+        return f"Контакт '{name}' видалений."
+    return f"Контакт '{name}' не знайдений."
@@ -0,0 +1,110 @@
+import json
+
+
+class Command:
+    # Зареєстрована команда. run(context, words, ask) розбирає аргументи й викликає
+    # обробник handler(*context, *аргументи), що повертає текст відповіді або None.
+    # mutates - команда змінює дані (пакетний режим і сервер зберігають лише після таких),
+    # exits - після команди цикл завершується
+    def __init__(self, name, run, prompts, mutates, exits):
+        self.name = name
+        self.run = run
+        self.prompts = prompts
+        self.mutates = mutates
+        self.exits = exits
+
+
+class CommandRegistry:
+    # Команди в словнику за назвою з одного чи кількох слів ("show all").
+    # Пошук - найдовша назва з перших слів рядка, не більше max_words звернень
+    # до словника незалежно від кількості команд; назва збігається цілими словами,
+    # тож "address" не потрапить у "add".
+    # error_handler (напр. input_error) обгортає розбір аргументів і обробник кожної команди
+    def __init__(self, error_handler=None):
+        self.commands = {}
+        self.max_words = 1
+        self.error_handler = error_handler
+
+    def command(self, *names, prompts=(), mutates=False, exits=False):
+        # Декоратор: @commands.command("add", "додати", prompts=("Імʼя: ", "Номер: "), mutates=True)
+        # prompts - підказки аргументів по порядку; останній аргумент забирає решту рядка
+        def register(handler):
+            def run(context, words, ask=None):
+                return handler(*context, *parse_args(words, prompts, ask))
+
+            command = Command(names[0], self.error_handler(run) if self.error_handler else run, prompts, mutates, exits)
+            for name in names:
+                key = " ".join(name.lower().split())
+                self.commands[key] = command
+                self.max_words = max(self.max_words, len(key.split()))
+            return handler
+
+        return register
+
+    def resolve(self, line):
+        # (команда або None, слова аргументів)
+        words = line.split()
+        for count in range(min(self.max_words, len(words)), 0, -1):
+            command = self.commands.get(" ".join(words[:count]).lower())
+            if command is not None:
+                return command, words[count:]
+        return None, words
+
+    def dispatch(self, line, *context, ask=None):
+        # (команда або None, відповідь); ask(підказка) - звідки брати аргументи, яких
+        # немає в рядку (input у REPL), без ask бракуючий аргумент - помилка вводу
+        command, words = self.resolve(line)
+        if command is None:
+            return None, None
+        return command, command.run(context, words, ask)
+
+
+def parse_args(words, prompts, ask=None):
+    args = words[:len(prompts)]
+    if prompts and len(words) > len(prompts):
+        args[-1] = " ".join(words[len(prompts) - 1:])
+    for prompt in prompts[len(args):]:
+        if ask is None:
+            raise IndexError(f"Бракує аргументу: {prompt.strip().rstrip(':')}")
+        args.append(ask(prompt))
+    return args
+
+
+def response_line(command, response, **fields):
+    # Відповідь одним рядком JSON: {..., "command": назва або null, "output": текст}
+    return json.dumps({**fields, "command": command.name if command else None, "output": response}, ensure_ascii=False) + "\n"
+
+
+def run_batch(registry, lines, output, *context, group=None):
+    # Пакетний режим: команда з аргументами на кожному рядку lines, без підказок
+    # (бракуючий аргумент - помилка вводу); порожні рядки й "#" - пропускаються.
+    # Відповіді - JSON Lines у output: {"line": номер, "command": назва або null, "output": текст}.
+    # group() - контекст для змінюючих команд поспіль (напр. book.batch): індекси оновлюються
+    # раз на групу, а група закривається перед першою командою, що читає.
+    # Повертає кількість виконаних команд
+    executed = 0
+    batch = None
+    try:
+        for number, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            command, words = registry.resolve(line)
+            if group is not None:
+                if command is not None and command.mutates:
+                    if batch is None:
+                        batch = group()
+                        batch.__enter__()
+                elif batch is not None:
+                    batch.__exit__(None, None, None)
+                    batch = None
+            response = command.run(context, words) if command is not None else None
+            output.write(response_line(command, response, line=number))
+            if command is not None:
+                executed += 1
+                if command.exits:
+                    break
+    finally:
+        if batch is not None:
+            batch.__exit__(None, None, None)
+    return executed
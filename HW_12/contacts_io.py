@@ -0,0 +1,249 @@
+import csv
+import json
+import os
+import sys
+import time
+
+from snapshot import is_snapshot, read_snapshot, unpack, write_snapshot
+
+
+# Потокове читання і запис контактів у чотирьох форматах:
+#   .jsonl - JSON Lines, один контакт на рядок;
+#   .csv   - колонки name, phones (через ";"), birthday;
+#   .abk   - стиснутий знімок з контрольною сумою (snapshot.py);
+#   інше   - {"contacts": [...]}, як address_book.json.
+# Файл читається частинами по CHUNK_SIZE і пишеться по одному контакту,
+# тож пам'ять не залежить від розміру книги.
+CHUNK_SIZE = 1 << 16
+WHITESPACE = " \t\n\r"
+
+
+def contacts_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    return extension if extension in (".jsonl", ".csv", ".abk") else ".json"
+
+
+def read_contacts(path):
+    # Генератор (номер запису, контакт); рядок JSONL, що не розбирається, повертається як є.
+    # Знімок розпізнається за вмістом, а не за розширенням
+    if is_snapshot(path):
+        for row, packed in enumerate(read_snapshot(path), 1):
+            yield row, unpack(packed)
+        return
+    file_format = contacts_format(path)
+    with open(path, "r", encoding="utf-8", newline="" if file_format == ".csv" else None) as file:
+        if file_format == ".jsonl":
+            yield from iter_jsonl(file)
+        elif file_format == ".csv":
+            yield from iter_csv(file)
+        else:
+            yield from iter_json(file)
+
+
+def iter_jsonl(file):
+    for row, line in enumerate(file, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield row, json.loads(line)
+        except json.JSONDecodeError:
+            yield row, line
+
+
+def iter_csv(file):
+    # Номер запису - номер рядка у файлі (заголовок - рядок 1)
+    reader = csv.DictReader(file)
+    for contact in reader:
+        phones = contact.get("phones")
+        yield reader.line_num, {
+            "name": contact.get("name"),
+            "phones": [phone.strip() for phone in phones.split(";") if phone.strip()] if phones else [],
+            "birthday": contact.get("birthday") or None,
+        }
+
+
+def csv_row(contact):
+    return [contact["name"], ";".join(contact["phones"]), contact.get("birthday") or ""]
+
+
+class JSONStream:
+    # Буфер над файлом для json.JSONDecoder.raw_decode: значення, що не вмістилося
+    # в буфер, розбирається знову після дочитування наступної частини
+    def __init__(self, file):
+        self.file = file
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        chunk = self.file.read(CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+
+    def peek(self):
+        # Перший символ після пробілів ("" у кінці файлу)
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer) or self.eof:
+                return self.buffer[self.pos:self.pos + 1]
+            self.fill()
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Очікувався '{char}'", self.buffer, self.pos)
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                self.fill()
+                continue
+            if end == len(self.buffer) and not self.eof:
+                # Число в кінці буфера могло обірватися - дочитуємо й повторюємо
+                self.fill()
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json(file):
+    # {"contacts": [...]}: решта ключів верхнього рівня пропускається
+    stream = JSONStream(file)
+    stream.expect("{")
+    if stream.peek() == "}":
+        return
+    while True:
+        key = stream.value()
+        stream.expect(":")
+        if key == "contacts":
+            stream.expect("[")
+            row = 0
+            if stream.peek() == "]":
+                stream.pos += 1
+            else:
+                while True:
+                    row += 1
+                    yield row, stream.value()
+                    if stream.peek() == "]":
+                        stream.pos += 1
+                        break
+                    stream.expect(",")
+        else:
+            stream.value()
+        if stream.peek() == "}":
+            return
+        stream.expect(",")
+
+
+def write_contacts(path, contacts, progress=None, sync=False, file_format=None):
+    # contacts - ітератор словників (для .abk - також упакованих записів, див. snapshot.py);
+    # повертає кількість записаних контактів. sync=True - fsync перед закриттям файлу; file_format - якщо не за розширенням path
+    count = 0
+    file_format = file_format or contacts_format(path)
+    if file_format == ".abk":
+        with open(path, "wb") as file:
+            count = write_snapshot(file, contacts, progress)
+            if sync:
+                file.flush()
+                os.fsync(file.fileno())
+        return count
+    with open(path, "w", encoding="utf-8", newline="" if file_format == ".csv" else None) as file:
+        if file_format == ".csv":
+            writer = csv.writer(file)
+            writer.writerow(["name", "phones", "birthday"])
+            for contact in contacts:
+                writer.writerow(csv_row(contact))
+                count += 1
+                if progress:
+                    progress.step()
+        elif file_format == ".jsonl":
+            for contact in contacts:
+                file.write(json.dumps(contact, ensure_ascii=False) + "\n")
+                count += 1
+                if progress:
+                    progress.step()
+        else:
+            file.write('{"contacts": [')
+            for contact in contacts:
+                file.write((",\n" if count else "\n") + json.dumps(contact, ensure_ascii=False))
+                count += 1
+                if progress:
+                    progress.step()
+            file.write("\n]}\n")
+        if sync:
+            file.flush()
+            os.fsync(file.fileno())
+    return count
+
+
+def write_atomic(path, contacts):
+    # Тимчасовий файл + fsync + os.replace: після збою на диску або старий файл,
+    # або новий, але ніколи не обірваний
+    temp_path = path + ".tmp"
+    count = write_contacts(temp_path, contacts, sync=True, file_format=contacts_format(path))
+    os.replace(temp_path, path)
+    if hasattr(os, "O_DIRECTORY"):
+        # fsync каталогу, щоб сама заміна пережила збій живлення
+        directory = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+    return count
+
+
+class Progress:
+    # Лічильник записів з живим рядком у stderr не частіше ніж раз на interval секунд
+    def __init__(self, label, interval=0.5, stream=sys.stderr):
+        self.label = label
+        self.count = 0
+        self.interval = interval
+        self.next_report = time.monotonic() + interval
+        self.stream = stream
+
+    def step(self):
+        self.count += 1
+        if self.count % 1000 == 0 and time.monotonic() >= self.next_report:
+            self.next_report = time.monotonic() + self.interval
+            self.stream.write(f"\r{self.label}: {self.count}")
+            self.stream.flush()
+
+    def track(self, items):
+        # Пропускає items далі, рахуючи кожен
+        for item in items:
+            yield item
+            self.step()
+
+    def finish(self):
+        if self.count >= 1000:
+            self.stream.write(f"\r{self.label}: {self.count}\n")
+            self.stream.flush()
+
+
+class RejectFile:
+    # Недійсні записи - у JSONL-файл (відкривається лише при першому відхиленні)
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.count = 0
+
+    def write(self, row, contact, error):
+        if self.file is None:
+            self.file = open(self.path, "w", encoding="utf-8")
+        self.file.write(json.dumps({"row": row, "error": error, "contact": contact}, ensure_ascii=False) + "\n")
+        self.count += 1
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
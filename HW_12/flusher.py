@@ -0,0 +1,53 @@
+import threading
+
+
+class Flusher(threading.Thread):
+    # Фонове збереження книги. Книга рахує зміни (book.changes) і повідомляє про них
+    # через book.on_change; потік зберігає через interval секунд після першої
+    # незбереженої зміни або відразу, коли їх набралося max_changes. Пачка змін -
+    # одне збереження, а без змін (лише читання) - жодного запису на диск.
+    # stop() зберігає все, що лишилося, і чекає завершення потоку.
+    def __init__(self, book, save, interval=2.0, max_changes=1000):
+        super().__init__(daemon=True)
+        self.book = book
+        self.save = save
+        self.interval = interval
+        self.max_changes = max_changes
+        self.changed = threading.Event()
+        self.full = threading.Event()
+        self.stopping = False
+        self.saves = 0
+        book.on_change = self.notify
+
+    def notify(self, changes):
+        self.changed.set()
+        if changes >= self.max_changes:
+            self.full.set()
+
+    def run(self):
+        # stopping перевіряється перед кожним очікуванням: flush скидає події, тож
+        # сигнал від stop(), що прийшов під час збереження, інакше загубився б
+        while not self.stopping:
+            self.changed.wait()
+            if self.stopping:
+                return
+            self.full.wait(self.interval)
+            self.flush()
+
+    def flush(self):
+        with self.book.lock:
+            self.changed.clear()
+            self.full.clear()
+            if not self.book.changes:
+                return
+            self.save(self.book)
+            self.book.changes = 0
+            self.saves += 1
+
+    def stop(self):
+        self.stopping = True
+        self.changed.set()
+        self.full.set()
+        if self.is_alive():
+            self.join()
+        self.flush()
@@ -0,0 +1,91 @@
+import json
+import os
+
+from storage import JSONStorage, move_aside
+
+
+class JournalStorage(JSONStorage):
+    # Знімок (address_book.json або .abk) плюс журнал змін FILENAME.log (JSON Lines):
+    #   {"op": "put", "contact": {...}}  - контакт доданий або змінений
+    #   {"op": "delete", "name": "..."}  - контакт видалений
+    # Кожна зміна - один рядок у кінці журналу, flush лише робить fsync журналу.
+    # Коли журнал перевищує compact_size байтів, знімок переписується
+    # (тимчасовий файл + os.replace) і журнал очищується. Записи журналу
+    # ідемпотентні, тож збій між заміною знімка й очищенням журналу безпечний.
+    lazy = False
+
+    def __init__(self, filename, compact_size=4 * 1024 * 1024):
+        super().__init__(filename)
+        self.log_path = filename + ".log"
+        self.compact_size = compact_size
+        self.log = None
+
+    def load(self):
+        contacts = {}
+        if self.source() is not None:
+            for row, contact in super().load():
+                if isinstance(contact, dict) and "name" in contact:
+                    contacts[contact["name"]] = contact
+        replayed = 0
+        if os.path.exists(self.log_path):
+            with open(self.log_path, "r", encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Недописаний останній рядок після збою - далі нічого немає
+                        break
+                    if entry["op"] == "put":
+                        contacts[entry["contact"]["name"]] = entry["contact"]
+                    elif entry["op"] == "delete":
+                        contacts.pop(entry["name"], None)
+                    replayed += 1
+        if replayed:
+            print(f"Відновлено змін із журналу: {replayed}")
+        return enumerate(contacts.values(), 1)
+
+    def set_aside(self):
+        # Журнал - зміни поверх пошкодженого знімка: відкладається разом з ним,
+        # інакше стиснення записало б знімок без старих контактів і очистило журнал
+        moved = super().set_aside()
+        self.close()
+        if os.path.exists(self.log_path):
+            moved.append(move_aside(self.log_path))
+        return moved
+
+    def load_packed(self):
+        # Знімок без журналу неповний - завжди через load
+        return None
+
+    def append(self, entry):
+        if self.log is None:
+            self.log = open(self.log_path, "a", encoding="utf-8")
+        self.log.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def put(self, contact):
+        self.append({"op": "put", "contact": contact})
+
+    def put_many(self, contacts):
+        for contact in contacts:
+            self.put(contact)
+
+    def delete(self, name):
+        self.append({"op": "delete", "name": name})
+
+    def flush(self, book):
+        if self.log is None:
+            return
+        self.log.flush()
+        os.fsync(self.log.fileno())
+        if self.log.tell() >= self.compact_size:
+            self.compact(book)
+
+    def compact(self, book):
+        self.rewrite(book)
+        self.log.close()
+        self.log = open(self.log_path, "w", encoding="utf-8")
+
+    def close(self):
+        if self.log is not None:
+            self.log.close()
+            self.log = None
@@ -0,0 +1,126 @@
+import bisect
+import heapq
+
+
+class TrigramIndex:
+    # Інвертований індекс трійок символів для пошуку підрядка.
+    # Кожен ключ (ім'я контакту) має один або кілька рядків (ім'я, телефони).
+    #  - запит від 3 символів: перетин множин для його трійок, починаючи з
+    #    найменшої, і перевірка "query in text" лише для кандидатів;
+    #  - коротший запит: об'єднання множин тих трійок, що його містять
+    #    (перебір словника трійок, а не книги). Рядки, коротші за 3 символи,
+    #    індексуються цілком, тож їх теж знаходить короткий запит.
+    # Рядки не зберігаються: індекс тримає значення, з якого texts(значення) відновлює
+    # їх у нижньому регістрі (напр. упаковані номери запису - той самий об'єкт, що в Record,
+    # а не копія), - для перевірки кандидатів і для видалення ключа після зміни запису.
+    def __init__(self, texts=None):
+        self.grams = {} #трійка -> множина ключів
+        self.values = {} #ключ -> проіндексоване значення
+        self.texts = texts or lower_texts
+
+    def add(self, key, value):
+        self.add_many([(key, value)])
+
+    def add_many(self, items):
+        # items - пари (ключ, значення); наявні ключі переіндексовуються
+        grams = self.grams
+        values = self.values
+        to_texts = self.texts
+        for key, value in items:
+            if key in values:
+                self.remove(key)
+            values[key] = value
+            for text in to_texts(value):
+                for gram in trigrams(text):
+                    keys = grams.get(gram)
+                    if keys is None:
+                        grams[gram] = {key}
+                    else:
+                        keys.add(key)
+
+    def remove(self, key):
+        if key not in self.values:
+            return
+        for text in self.texts(self.values.pop(key)):
+            for gram in trigrams(text):
+                keys = self.grams.get(gram)
+                if keys is None:
+                    continue
+                keys.discard(key)
+                if not keys:
+                    del self.grams[gram]
+
+    def replace(self, key, value):
+        self.add_many([(key, value)])
+
+    def find(self, query):
+        # Множина ключів, у рядках яких є query
+        query = query.lower()
+        if not query:
+            return set(self.values)
+        if len(query) < 3:
+            found = set()
+            for gram, keys in self.grams.items():
+                if query in gram:
+                    found |= keys
+            return found
+
+        postings = []
+        for gram in trigrams(query):
+            keys = self.grams.get(gram)
+            if keys is None:
+                return set()
+            postings.append(keys)
+        postings.sort(key=len)
+        candidates = postings[0].intersection(*postings[1:])
+        if len(query) == 3:
+            return candidates
+        return {key for key in candidates if any(query in text for text in self.texts(self.values[key]))}
+
+    def search(self, query, limit=None, offset=0):
+        # Відсортовані ключі - сторінки стабільні між викликами.
+        # Для сторінки сортується лише її початок, а не всі збіги
+        found = self.find(query)
+        if limit is None:
+            return sorted(found)[offset:]
+        return heapq.nsmallest(offset + limit, found)[offset:]
+
+
+def lower_texts(texts):
+    return [text.lower() for text in texts]
+
+
+def trigrams(text):
+    if len(text) < 3:
+        return {text} if text else set()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SortedNames:
+    # Відсортовані ключі для сторінок за курсором (ім'ям останнього запису).
+    # Список будується при першому запиті сторінки, далі оновлюється через bisect,
+    # тож завантаження книги не платить за сортування.
+    def __init__(self):
+        self.names = None
+
+    def build(self, names):
+        self.names = sorted(names)
+
+    def add(self, name):
+        if self.names is None:
+            return
+        index = bisect.bisect_left(self.names, name)
+        if index == len(self.names) or self.names[index] != name:
+            self.names.insert(index, name)
+
+    def remove(self, name):
+        if self.names is None:
+            return
+        index = bisect.bisect_left(self.names, name)
+        if index < len(self.names) and self.names[index] == name:
+            del self.names[index]
+
+    def after(self, cursor, size):
+        # До size імен, що йдуть після cursor (з початку, якщо cursor None)
+        start = 0 if cursor is None else bisect.bisect_right(self.names, cursor)
+        return self.names[start:start + size]
@@ -0,0 +1,133 @@
+import asyncio
+import signal
+
+from commands import response_line
+
+
+# Команди, що працюють з файлами на сервері, через мережу недоступні
+LOCAL_ONLY = {"import", "export"}
+
+
+class BookServer:
+    # TCP-сервер адресної книги: клієнт надсилає рядок команди з аргументами
+    # ("add ann 0123456789"), сервер відповідає рядком JSON {"command": ..., "output": ...}.
+    # Команди, що читають, виконуються відразу в циклі подій. Змінюючі команди йдуть
+    # у обмежену чергу, яку розбирає одна задача-писач: усе, що назбиралося (до group_size),
+    # виконується одним book.batch(), тож індекси оновлюються раз на групу, а не на команду.
+    # З'єднання читає наступний рядок лише після того, як відповідь відправлена (drain),
+    # тож клієнт, що не читає відповідей, зупиняє лише себе; повна черга змін так само
+    # пригальмовує клієнтів, що пишуть.
+    def __init__(self, book, commands, host="127.0.0.1", port=8765, queue_size=1000, group_size=500):
+        self.book = book
+        self.commands = commands
+        self.host = host
+        self.port = port
+        self.queue_size = queue_size
+        self.group_size = group_size
+        self.queue = None
+        self.stopping = None
+        self.connections = set()
+        self.handlers = set()
+
+    async def run(self):
+        # До SIGINT/SIGTERM; перед виходом виконує всі зміни, що вже в черзі.
+        # Обробники з'єднань і задача-писач завершуються тут, а не при закритті циклу подій
+        loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(self.queue_size)
+        self.stopping = asyncio.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, self.stopping.set)
+        writer_task = asyncio.create_task(self.apply_mutations())
+        server = await asyncio.start_server(self.handle, self.host, self.port)
+        print(f"Сервер слухає {', '.join(str(sock.getsockname()) for sock in server.sockets)}")
+        async with server:
+            await self.stopping.wait()
+            server.close()
+            for writer in list(self.connections):
+                writer.close()
+            for task in self.handlers:
+                task.cancel()
+            await asyncio.gather(*self.handlers, return_exceptions=True)
+        await self.queue.join()
+        writer_task.cancel()
+        await asyncio.gather(writer_task, return_exceptions=True)
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.remove_signal_handler(signum)
+
+    async def apply_mutations(self):
+        while True:
+            items = [await self.queue.get()]
+            while len(items) < self.group_size and not self.queue.empty():
+                items.append(self.queue.get_nowait())
+            await self.acquire_book()
+            try:
+                with self.book.batch():
+                    for command, words, future in items:
+                        # Зміна виконується, навіть якщо клієнт уже не чекає відповіді
+                        try:
+                            response = command.run((self.book,), words)
+                        except Exception as e:
+                            if not future.cancelled():
+                                future.set_exception(e)
+                        else:
+                            if not future.cancelled():
+                                future.set_result(response)
+            finally:
+                self.book.lock.release()
+            for item in items:
+                self.queue.task_done()
+
+    async def acquire_book(self):
+        # Замок книги на час збереження тримає Flusher. Цикл подій на ньому не блокується:
+        # поки замок зайнятий, чекає потік пулу, а читаючі команди тим часом виконуються.
+        # Захоплює замок сам цикл (RLock звільняє лише потік-власник)
+        while not self.book.lock.acquire(blocking=False):
+            await asyncio.get_running_loop().run_in_executor(None, self.wait_unlocked)
+
+    def wait_unlocked(self):
+        with self.book.lock:
+            pass
+
+    async def handle(self, reader, writer):
+        task = asyncio.current_task()
+        self.handlers.add(task)
+        self.connections.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                line = line.decode("utf-8", "replace").strip()
+                if not line:
+                    continue
+                command, words = self.commands.resolve(line)
+                if command is None:
+                    response = None
+                elif command.name in LOCAL_ONLY:
+                    response = "Команда недоступна через мережу."
+                elif command.mutates:
+                    future = asyncio.get_running_loop().create_future()
+                    await self.queue.put((command, words, future))
+                    response = await future
+                else:
+                    response = command.run((self.book,), words)
+                writer.write(response_line(command, response).encode("utf-8"))
+                await writer.drain()
+                if command is not None and command.exits:
+                    break
+        except (ConnectionError, ValueError):
+            # Обрив з'єднання або рядок, довший за ліміт StreamReader
+            pass
+        except asyncio.CancelledError:
+            # Зупинка сервера: з'єднання просто закривається. Скасування далі не йде -
+            # StreamReaderProtocol у Python 3.11 логує скасований обробник як помилку.
+            # Зміна, що вже в черзі, все одно виконається (див. apply_mutations)
+            pass
+        finally:
+            self.handlers.discard(task)
+            self.connections.discard(writer)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
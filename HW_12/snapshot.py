@@ -0,0 +1,130 @@
+import json
+import struct
+import zlib
+from datetime import date
+
+
+# Знімок книги (.abk): заголовок і стиснутий zlib JSON Lines без пробілів.
+# Рядок - упакований запис [ім'я, [номери як цілі], дата як date.toordinal() або null],
+# як у Record.from_packed, тож завантаження не перевіряє й не перетворює значення заново.
+# Заголовок:
+#   MAGIC (4 байти), версія (2), резерв (2), кількість записів (8),
+#   довжина стиснутих даних (8), CRC32 стиснутих даних (4).
+# Файл з будь-яким розширенням розпізнається за MAGIC, тож старі .json читаються як раніше.
+MAGIC = b"ABK\x01"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQQI")
+LEVEL = 1
+CHUNK_SIZE = 1 << 16
+
+
+def pack(contact):
+    # Словник контакту -> упакований запис
+    birthday = contact.get("birthday")
+    return [
+        contact["name"],
+        [int(phone) for phone in contact["phones"]],
+        date.fromisoformat(birthday).toordinal() if birthday else None,
+    ]
+
+
+def unpack(packed):
+    name, numbers, birthday = packed
+    return {
+        "name": name,
+        "phones": [f"{number:010d}" for number in numbers],
+        "birthday": None if birthday is None else date.fromordinal(birthday).isoformat(),
+    }
+
+
+def is_snapshot(path):
+    try:
+        with open(path, "rb") as file:
+            return file.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def write_snapshot(file, contacts, progress=None):
+    # file - відкритий для запису двійковий файл; contacts - словники або вже упаковані записи.
+    # Заголовок дописується в кінці, коли відомі кількість, довжина і CRC32
+    file.write(HEADER.pack(MAGIC, VERSION, 0, 0, 0, 0))
+    compressor = zlib.compressobj(LEVEL)
+    count = length = crc = 0
+    lines = []
+    size = 0
+    for contact in contacts:
+        if isinstance(contact, dict):
+            contact = pack(contact)
+        line = json.dumps(contact, ensure_ascii=False, separators=(",", ":"))
+        lines.append(line)
+        size += len(line)
+        count += 1
+        if progress:
+            progress.step()
+        if size >= CHUNK_SIZE:
+            data = compressor.compress(("\n".join(lines) + "\n").encode("utf-8"))
+            file.write(data)
+            length += len(data)
+            crc = zlib.crc32(data, crc)
+            lines = []
+            size = 0
+    data = (compressor.compress(("\n".join(lines) + "\n").encode("utf-8")) if lines else b"") + compressor.flush()
+    file.write(data)
+    length += len(data)
+    crc = zlib.crc32(data, crc)
+    file.seek(0)
+    file.write(HEADER.pack(MAGIC, VERSION, 0, count, length, crc))
+    file.seek(0, 2)
+    return count
+
+
+def read_header(file):
+    header = file.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise ValueError("Пошкоджений знімок: неповний заголовок")
+    magic, version, reserved, count, length, crc = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError("Файл не є знімком адресної книги")
+    if version != VERSION:
+        raise ValueError(f"Непідтримувана версія знімка: {version}")
+    return count, length, crc
+
+
+def iter_snapshot(file):
+    # Генератор упакованих записів. Контрольна сума перевіряється до першого запису,
+    # тож пошкоджений файл не додає в книгу нічого
+    count, length, crc = read_header(file)
+    actual_length = actual_crc = 0
+    while True:
+        chunk = file.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        actual_length += len(chunk)
+        actual_crc = zlib.crc32(chunk, actual_crc)
+    if actual_length != length or actual_crc != crc:
+        raise ValueError("Пошкоджений знімок: не збігається контрольна сума")
+
+    file.seek(HEADER.size)
+    decompressor = zlib.decompressobj()
+    rest = b""
+    read = 0
+    while True:
+        chunk = file.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        data = rest + decompressor.decompress(chunk)
+        end = data.rfind(b"\n") + 1
+        rest = data[end:]
+        if end:
+            # Уся частина - один масив JSON: один виклик json.loads замість виклику на рядок
+            packed = json.loads(b"[" + data[:end - 1].replace(b"\n", b",") + b"]")
+            read += len(packed)
+            yield from packed
+    if rest or read != count:
+        raise ValueError("Пошкоджений знімок: неповні дані")
+
+
+def read_snapshot(path):
+    with open(path, "rb") as file:
+        yield from iter_snapshot(file)
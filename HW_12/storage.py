@@ -0,0 +1,202 @@
+import itertools
+import os
+import sqlite3
+
+from contacts_io import contacts_format, read_contacts, write_atomic
+from snapshot import is_snapshot, read_snapshot
+
+
+# Сховища для AddressBook. Працюють зі словниками контактів
+# {"name": ..., "phones": [...], "birthday": ...}, а не з Record.
+# lazy=False - уся книга читається при старті (load - генератор (номер, контакт))
+#              і записується в flush;
+# lazy=True - записи читаються на вимогу (get), кожна зміна - один рядок (put/delete).
+
+
+class JSONStorage:
+    # Формат за розширенням: address_book.json, JSON Lines (.jsonl) або знімок (.abk).
+    # При кожному flush файл переписується повністю через тимчасовий файл і os.replace,
+    # але читання і запис ідуть по одному контакту
+    lazy = False
+
+    def __init__(self, filename):
+        self.filename = filename
+
+    def source(self):
+        # Файл, з якого завантажується книга, або None. Знімка ще немає - книга
+        # з address_book.json поруч, наступне збереження запише знімок
+        if os.path.exists(self.filename):
+            return self.filename
+        legacy = os.path.splitext(self.filename)[0] + ".json"
+        if contacts_format(self.filename) == ".abk" and os.path.exists(legacy):
+            return legacy
+        return None
+
+    def load(self):
+        source = self.source()
+        if source is None:
+            print(f"Файл '{self.filename}' не існує.")
+            return iter(())
+        if source != self.filename:
+            print(f"Завантаження з '{source}', зберігатиметься в '{self.filename}'.")
+        return read_contacts(source)
+
+    def set_aside(self):
+        # Файл, що не прочитався, відкладається поруч, щоб наступне збереження
+        # не затерло єдину копію даних; повертає нові назви файлів
+        source = self.source()
+        if source is None:
+            return []
+        return [move_aside(source)]
+
+    def load_packed(self):
+        # Упаковані записи, якщо файл - знімок .abk (див. snapshot.py), інакше None
+        if not is_snapshot(self.filename):
+            return None
+        return read_snapshot(self.filename)
+
+    def put(self, contact):
+        pass
+
+    def put_many(self, contacts):
+        pass
+
+    def delete(self, name):
+        pass
+
+    def flush(self, book):
+        self.rewrite(book)
+
+    def rewrite(self, book):
+        # Знімок пишеться з упакованих записів книги, без перетворення на словники
+        write_atomic(self.filename, book.packed() if contacts_format(self.filename) == ".abk" else book.contacts())
+
+    def close(self):
+        pass
+
+
+def move_aside(path):
+    # path -> path.corrupt (або path.corrupt.N, якщо такий уже є)
+    target = path + ".corrupt"
+    number = 0
+    while os.path.exists(target):
+        number += 1
+        target = f"{path}.corrupt.{number}"
+    os.rename(path, target)
+    return target
+
+
+class SQLiteStorage:
+    # Книга в SQLite: контакт - рядок у contacts, телефони - рядки в phones.
+    # Індекси: первинний ключ на імені та (phone, name) для пошуку за номером.
+    # Зміни пишуться відразу, а flush лише фіксує транзакцію.
+    lazy = True
+
+    def __init__(self, filename):
+        self.filename = filename
+        # flush (commit) може викликати фоновий потік збереження - під book.lock
+        self.connection = sqlite3.connect(filename, check_same_thread=False)
+        self.connection.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS contacts (
+                name TEXT PRIMARY KEY,
+                birthday TEXT
+            );
+            CREATE TABLE IF NOT EXISTS phones (
+                name TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                phone TEXT NOT NULL,
+                PRIMARY KEY (name, position)
+            );
+            CREATE INDEX IF NOT EXISTS phones_phone ON phones (phone, name);
+            CREATE INDEX IF NOT EXISTS contacts_birthday ON contacts (substr(birthday, 6));
+        """)
+
+    def get(self, name):
+        row = self.connection.execute("SELECT birthday FROM contacts WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return None
+        phones = [phone for (phone,) in self.connection.execute(
+            "SELECT phone FROM phones WHERE name = ? ORDER BY position", (name,))]
+        return {"name": name, "phones": phones, "birthday": row[0]}
+
+    def put(self, contact):
+        name = contact["name"]
+        self.connection.execute("INSERT OR REPLACE INTO contacts (name, birthday) VALUES (?, ?)", (name, contact.get("birthday")))
+        self.connection.execute("DELETE FROM phones WHERE name = ?", (name,))
+        self.connection.executemany(
+            "INSERT INTO phones (name, position, phone) VALUES (?, ?, ?)",
+            ((name, position, phone) for position, phone in enumerate(contact["phones"])),
+        )
+
+    def put_many(self, contacts):
+        # Пакет контактів: три executemany замість трьох запитів на кожен контакт
+        contacts = list(contacts)
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO contacts (name, birthday) VALUES (?, ?)",
+            ((contact["name"], contact.get("birthday")) for contact in contacts))
+        self.connection.executemany("DELETE FROM phones WHERE name = ?", ((contact["name"],) for contact in contacts))
+        self.connection.executemany(
+            "INSERT INTO phones (name, position, phone) VALUES (?, ?, ?)",
+            ((contact["name"], position, phone) for contact in contacts for position, phone in enumerate(contact["phones"])),
+        )
+
+    def delete(self, name):
+        self.connection.execute("DELETE FROM contacts WHERE name = ?", (name,))
+        self.connection.execute("DELETE FROM phones WHERE name = ?", (name,))
+
+    def names(self):
+        for (name,) in self.connection.execute("SELECT name FROM contacts ORDER BY name"):
+            yield name
+
+    def count(self):
+        return self.connection.execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
+
+    def contacts(self, after=None, limit=None):
+        # Один прохід по обох таблицях, відсортованих за іменем - без запиту на кожен контакт.
+        # after/limit - сторінка: до limit контактів з іменем після after
+        rows = self.connection.execute("""
+            SELECT c.name, c.birthday, p.phone FROM contacts c
+            LEFT JOIN phones p ON p.name = c.name
+            WHERE c.name IN (SELECT name FROM contacts WHERE name > ? ORDER BY name LIMIT ?)
+            ORDER BY c.name, p.position
+        """, ("" if after is None else after, -1 if limit is None else limit))
+        for name, group in itertools.groupby(rows, key=lambda row: row[0]):
+            group = list(group)
+            phones = [row[2] for row in group if row[2] is not None]
+            yield {"name": name, "phones": phones, "birthday": group[0][1]}
+
+    def search_name(self, query, limit=None, offset=0):
+        cursor = self.connection.execute(
+            "SELECT name FROM contacts WHERE instr(lower(name), ?) > 0 ORDER BY name LIMIT ? OFFSET ?",
+            (query.lower(), -1 if limit is None else limit, offset))
+        return [name for (name,) in cursor]
+
+    def search_phone(self, query, limit=None, offset=0):
+        # Сканується лише покривний індекс phones_phone, а не таблиця
+        cursor = self.connection.execute(
+            "SELECT DISTINCT name FROM phones INDEXED BY phones_phone WHERE instr(phone, ?) > 0 ORDER BY name LIMIT ? OFFSET ?",
+            (query, -1 if limit is None else limit, offset))
+        return [name for (name,) in cursor]
+
+    def birthdays_on(self, month_days):
+        # month_days - список "MM-DD"; запит іде індексом contacts_birthday
+        placeholders = ", ".join("?" * len(month_days))
+        cursor = self.connection.execute(
+            f"SELECT name FROM contacts WHERE substr(birthday, 6) IN ({placeholders}) ORDER BY name", month_days)
+        return [name for (name,) in cursor]
+
+    def flush(self, book=None):
+        self.connection.commit()
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
+
+
+def open_storage(filename):
+    # Сховище обирається за розширенням файлу
+    if os.path.splitext(filename)[1].lower() in (".db", ".sqlite", ".sqlite3"):
+        return SQLiteStorage(filename)
+    return JSONStorage(filename)
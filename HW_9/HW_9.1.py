@@ -1,5 +1,12 @@
+import argparse
+import os
 import sys # ;D
 
+# Реєстр команд спільний з HW_12
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "HW_12"))
+
+from commands import CommandRegistry, run_batch
+
 def input_error(func):
     def inner(*args, **kwargs):
         try:
@@ -10,24 +17,31 @@ def input_error(func):
     return inner
 
 contacts = {}
+commands = CommandRegistry(input_error)
+
+@commands.command("good bye", "close", "exit", exits=True)
+def goodbye():
+    return "Good bye!"
+
+@commands.command("hello", "hi", "hallo")
+def hello():
+    return "How can I help you?"
 
-@input_error
-def add_contact(command):
-    _, name, phone = command.split()
+@commands.command("add", prompts=("Name: ", "Phone: "), mutates=True)
+def add_contact(name, phone):
     contacts[name] = phone
     return f"Contact '{name}' with phone '{phone}' has been added."
 
-@input_error
-def change_phone(command):
-    _, name, phone = command.split()
+@commands.command("change", prompts=("Name: ", "Phone: "), mutates=True)
+def change_phone(name, phone):
     contacts[name] = phone
     return f"Phone number for contact '{name}' has been changed to '{phone}'."
 
-@input_error
-def show_phone(command):
-    _, name = command.split()
+@commands.command("phone", prompts=("Name: ",))
+def show_phone(name):
     return f"Phone number for contact '{name}': {contacts[name]}"
 
+@commands.command("show all")
 def show_all_contacts():
     if not contacts:
         return "No contacts found."
@@ -35,30 +49,24 @@ def show_all_contacts():
     return result
 
 def main():
+    parser = argparse.ArgumentParser(description="Contact bot")
+    parser.add_argument("--batch", metavar="FILE", help="run commands from FILE (- for stdin), one per line; replies as JSON Lines")
+    args = parser.parse_args()
+    if args.batch:
+        with (sys.stdin if args.batch == "-" else open(args.batch, "r", encoding="utf-8")) as lines:
+            run_batch(commands, (line.lower() for line in lines), sys.stdout)
+        return
+
     print("How can I help you?")
 
     while True:
-        command = input("> ").lower()
-
-        if command == "good bye" or command == "close" or command == "exit":
-            print("Good bye!")
-            break
-        elif command == "hello" or command == "hi" or command == "hallo":
-            print("How can I help you?")
-        elif command.startswith("add"):
-            response = add_contact(command)
-            print(response)
-        elif command.startswith("change"):
-            response = change_phone(command)
-            print(response)
-        elif command.startswith("phone"):
-            response = show_phone(command)
-            print(response)
-        elif command == "show all":
-            response = show_all_contacts()
-            print(response)
-        else:
+        command, response = commands.dispatch(input("> ").lower(), ask=input)
+        if command is None:
             print("Unknown command. Please try again.")
+            continue
+        print(response)
+        if command.exits:
+            break
 
 if __name__ == "__main__":
     main()
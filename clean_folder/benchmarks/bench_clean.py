@@ -0,0 +1,169 @@
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from clean_folder import Transliterator
+from clean_folder.categories import DEFAULT_CATEGORIES, build_registry
+from clean_folder.clean import execute_tasks, scan_folder
+from clean_folder.scanner import EmptyDirTracker, scandir_walk
+
+
+DEFAULT_EXT_MIX = "jpg=25,png=10,mp4=5,txt=20,pdf=10,docx=5,mp3=10,wav=5,xyz=10"
+CYRILLIC = "абвгґдеєжзиіїйклмнопрстуфхцчшщьюяАБВГҐДЕЄЖЗИІЇЙКЛМНОПРСТУФХЦЧШЩЮЯ"
+LATIN = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+PHASES = ("scan", "classify", "normalize", "move", "extract", "cleanup")
+
+
+def parse_ext_mix(option):
+    mix = {}
+    for item in option.split(","):
+        ext, _, weight = item.partition("=")
+        mix[ext.strip().lower()] = float(weight or 1)
+    return mix
+
+
+def random_name(rng, cyrillic_ratio):
+    alphabet = CYRILLIC if rng.random() < cyrillic_ratio else LATIN
+    return "".join(rng.choice(alphabet + "0123456789 -") for _ in range(rng.randint(4, 24))).strip() or "f"
+
+
+def make_tree(root, files, depth, ext_mix, cyrillic_ratio, archives, seed):
+    # Відтворюване синтетичне дерево: та сама комбінація параметрів і seed дає те саме дерево
+    rng = random.Random(seed)
+    extensions = list(ext_mix)
+    weights = [ext_mix[ext] for ext in extensions]
+    dirs = [root]
+    for _ in range(max(1, files // 50)):
+        parent = rng.choice(dirs)
+        if parent.count(os.sep) - root.count(os.sep) < depth:
+            dirs.append(os.path.join(parent, random_name(rng, cyrillic_ratio)))
+    for path in dirs:
+        os.makedirs(path, exist_ok=True)
+
+    for index in range(files):
+        extension = rng.choices(extensions, weights)[0]
+        path = os.path.join(rng.choice(dirs), f"{random_name(rng, cyrillic_ratio)}_{index}.{extension}")
+        with open(path, "wb") as file:
+            file.write(rng.randbytes(rng.randint(0, 4096)))
+
+    for index in range(archives):
+        path = os.path.join(rng.choice(dirs), f"{random_name(rng, cyrillic_ratio)}_{index}.zip")
+        with zipfile.ZipFile(path, "w") as archive:
+            for member in range(rng.randint(1, 10)):
+                archive.writestr(f"{member}.txt", rng.randbytes(rng.randint(0, 4096)))
+
+
+def replay(listing):
+    # Walker для scan_folder з уже зібраного списку, щоб не вимірювати обхід двічі
+    for root, dirs, files in listing:
+        yield root, list(dirs), files
+
+
+def run_once(folder):
+    timings = {}
+    buckets = tuple(DEFAULT_CATEGORIES)
+
+    start = time.perf_counter()
+    listing = []
+    for root, dirs, files in scandir_walk(folder):
+        if root == folder:
+            dirs[:] = [d for d in dirs if d not in buckets]
+        listing.append((root, list(dirs), files))
+    timings["scan"] = time.perf_counter() - start
+
+    registry = build_registry(DEFAULT_CATEGORIES)
+    start = time.perf_counter()
+    for root, dirs, files in listing:
+        for file in files:
+            registry.get(file.split(".")[-1].upper())
+    timings["classify"] = time.perf_counter() - start
+
+    transliterator = Transliterator(cache_size=0)
+    start = time.perf_counter()
+    for root, dirs, files in listing:
+        for file in files:
+            transliterator(file.split(".")[0])
+    timings["normalize"] = time.perf_counter() - start
+
+    tracker = EmptyDirTracker(folder)
+    tasks = list(scan_folder(folder, replay(listing), DEFAULT_CATEGORIES, tracker=tracker))
+    moves = [task for task in tasks if task.action == "move"]
+    archives = [task for task in tasks if task.action == "unpack"]
+
+    start = time.perf_counter()
+    execute_tasks(moves)
+    timings["move"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    execute_tasks(archives)
+    timings["extract"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tracker.sweep(buckets)
+    timings["cleanup"] = time.perf_counter() - start
+
+    return timings
+
+
+def compare(results, baseline):
+    print(f"{'phase':<10} {'baseline':>10} {'current':>10} {'change':>8}")
+    for phase in PHASES + ("total",):
+        old = baseline["phases"].get(phase) if phase != "total" else baseline.get("total")
+        new = results["phases"].get(phase) if phase != "total" else results["total"]
+        if not old:
+            continue
+        print(f"{phase:<10} {old:>10.4f} {new:>10.4f} {(new - old) / old * 100:>+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк clean-folder на синтетичному дереві (локально, без мережі).")
+    parser.add_argument("--files", type=int, default=10_000, help="кількість файлів")
+    parser.add_argument("--depth", type=int, default=4, help="максимальна глибина вкладення папок")
+    parser.add_argument("--ext-mix", default=DEFAULT_EXT_MIX, help="розширення і ваги, напр. jpg=30,txt=20,xyz=5")
+    parser.add_argument("--cyrillic-ratio", type=float, default=0.5, help="частка кириличних імен")
+    parser.add_argument("--archives", type=int, default=50, help="кількість zip-архівів")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3, help="кількість повторів; для кожної фази береться мінімум")
+    parser.add_argument("--tmpdir", default="/dev/shm" if os.path.isdir("/dev/shm") else None, help="де створювати дерево (tmpfs за замовчуванням)")
+    parser.add_argument("--output", help="записати результат у JSON")
+    parser.add_argument("--baseline", help="JSON з попереднього запуску для порівняння")
+    args = parser.parse_args()
+
+    params = {
+        "files": args.files, "depth": args.depth, "ext_mix": parse_ext_mix(args.ext_mix),
+        "cyrillic_ratio": args.cyrillic_ratio, "archives": args.archives, "seed": args.seed,
+    }
+    phases = {phase: float("inf") for phase in PHASES}
+    for _ in range(args.repeat):
+        folder = tempfile.mkdtemp(prefix="clean_folder_bench_", dir=args.tmpdir)
+        try:
+            make_tree(folder, args.files, args.depth, params["ext_mix"], args.cyrillic_ratio, args.archives, args.seed)
+            for phase, seconds in run_once(folder).items():
+                phases[phase] = min(phases[phase], seconds)
+        finally:
+            shutil.rmtree(folder, ignore_errors=True)
+
+    results = {"params": params, "phases": phases, "total": sum(phases.values())}
+    print(json.dumps(results, indent=4, ensure_ascii=False))
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=4, ensure_ascii=False)
+    if args.baseline:
+        with open(args.baseline, "r") as file:
+            baseline = json.load(file)
+        if baseline.get("params") != params:
+            print("Увага: параметри базового запуску відрізняються")
+        compare(results, baseline)
+
+
+if __name__ == "__main__":
+    main()
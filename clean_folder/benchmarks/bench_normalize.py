@@ -0,0 +1,75 @@
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from clean_folder import TRANSLIT_DICT, Transliterator
+
+
+# Попередня реалізація normalize() - для порівняння швидкості і результату
+def legacy_normalize(text, translit_dict):
+    normalized_text = ""
+    for char in text:
+        if char.isalpha() and char.isascii():
+            normalized_text += char
+        elif char in translit_dict:
+            normalized_text += translit_dict[char]
+        else:
+            normalized_text += "_"
+
+    invalid_chars = r'[^\w.]'
+    normalized_text = re.sub(invalid_chars, '_', normalized_text)
+
+    return normalized_text
+
+
+def make_names(count, unique, seed):
+    # Мішанина кириличних і латинських імен; unique - скільки різних стемів
+    random.seed(seed)
+    cyrillic = 'абвгґдеєжзиіїйклмнопрстуфхцчшщьюяАБВГҐДЕЄЖЗИІЇЙКЛМНОПРСТУФХЦЧШЩЮЯ'
+    latin = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    other = '0123456789 -_()'
+    stems = []
+    for _ in range(unique):
+        alphabet = cyrillic if random.random() < 0.5 else latin
+        stems.append(''.join(random.choice(alphabet + other) for _ in range(random.randint(5, 30))))
+    return [random.choice(stems) for _ in range(count)]
+
+
+def measure(func, names):
+    start = time.perf_counter()
+    for name in names:
+        func(name)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Мікробенчмарк normalize(): стара реалізація проти Transliterator.")
+    parser.add_argument("--count", type=int, default=1_000_000, help="кількість імен файлів")
+    parser.add_argument("--unique", type=int, default=200_000, help="кількість різних стемів")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    names = make_names(args.count, args.unique, args.seed)
+
+    transliterator = Transliterator()
+    uncached = Transliterator(cache_size=0)
+    mismatches = sum(1 for name in set(names) if transliterator(name) != legacy_normalize(name, TRANSLIT_DICT))
+    transliterator.normalize.cache_clear()
+
+    legacy_time = measure(lambda name: legacy_normalize(name, TRANSLIT_DICT), names)
+    uncached_time = measure(uncached, names)
+    cached_time = measure(transliterator, names)
+
+    print(f"names: {args.count}, unique stems: {args.unique}, mismatches: {mismatches}")
+    print(f"legacy normalize:        {legacy_time:8.3f} s")
+    print(f"Transliterator (no LRU): {uncached_time:8.3f} s  x{legacy_time / uncached_time:.1f}")
+    print(f"Transliterator (LRU):    {cached_time:8.3f} s  x{legacy_time / cached_time:.1f}")
+
+
+if __name__ == "__main__":
+    main()
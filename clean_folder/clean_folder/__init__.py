@@ -0,0 +1 @@
+from clean_folder.translit import TRANSLIT_DICT, Transliterator, normalize
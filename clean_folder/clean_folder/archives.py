@@ -0,0 +1,143 @@
+import bz2
+import gzip
+import lzma
+import os
+import shutil
+import tarfile
+import zipfile
+import zlib
+
+
+CHUNK_SIZE = 1024 * 1024
+
+# Обмеження за замовчуванням: сумарний розпакований розмір і кількість файлів в архіві
+DEFAULT_MAX_SIZE = 10 * 1024 ** 3
+DEFAULT_MAX_MEMBERS = 100_000
+
+# Подвійні розширення tar-архівів, які file.split(".")[-1] бачить як GZ/BZ2/XZ
+# (усі ці розширення - у категорії archives, див. categories.py)
+TAR_SUFFIXES = {
+    '.tar': 'tar',
+    '.tar.gz': 'gztar', '.tgz': 'gztar',
+    '.tar.bz2': 'bztar', '.tbz2': 'bztar',
+    '.tar.xz': 'xztar', '.txz': 'xztar',
+}
+
+
+class ArchiveError(Exception):
+    pass
+
+
+def archive_format(file_name):
+    # Формат архіву за ім'ям файлу: zip, tar, gztar, bztar, xztar або gz/bz2/xz (один стиснутий файл)
+    lower_name = file_name.lower()
+    for suffix, archive_type in sorted(TAR_SUFFIXES.items(), key=lambda item: -len(item[0])):
+        if lower_name.endswith(suffix):
+            return archive_type
+    return lower_name.rsplit('.', 1)[-1]
+
+
+def safe_path(destination, member_name, is_dir=False):
+    # Захист від "../" та абсолютних шляхів у іменах файлів архіву;
+    # сама папка призначення дозволена лише для каталогу ("." у tar-архіві)
+    path = os.path.normpath(os.path.join(destination, member_name))
+    root = os.path.normpath(destination)
+    if is_dir and path == root:
+        return path
+    if not path.startswith(root + os.sep):
+        raise ArchiveError(f"небезпечний шлях у архіві: {member_name}")
+    return path
+
+
+class Limits:
+    def __init__(self, max_size, max_members):
+        self.max_size = max_size
+        self.max_members = max_members
+        self.size = 0
+        self.members = 0
+
+    def add_member(self):
+        self.members += 1
+        if self.members > self.max_members:
+            raise ArchiveError(f"більше ніж {self.max_members} файлів")
+
+    def add_bytes(self, count):
+        self.size += count
+        if self.size > self.max_size:
+            raise ArchiveError(f"розпакований розмір перевищує {self.max_size} байт")
+
+
+def copy_stream(source, path, limits):
+    # Потокове копіювання частинами; ліміт перевіряється за фактичними байтами, а не за заголовком
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as target:
+        while True:
+            chunk = source.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            limits.add_bytes(len(chunk))
+            target.write(chunk)
+
+
+def extract_zip(source, destination, limits):
+    with zipfile.ZipFile(source) as archive:
+        for info in archive.infolist():
+            limits.add_member()
+            path = safe_path(destination, info.filename, info.is_dir())
+            if info.is_dir():
+                os.makedirs(path, exist_ok=True)
+                continue
+            with archive.open(info) as member:
+                copy_stream(member, path, limits)
+
+
+def extract_tar(source, destination, limits):
+    # Послідовне читання tar ('r|*'), без побудови списку всіх членів у пам'яті;
+    # посилання і спеціальні файли пропускаються
+    with tarfile.open(source, 'r|*') as archive:
+        for member in archive:
+            limits.add_member()
+            path = safe_path(destination, member.name, member.isdir())
+            if member.isdir():
+                os.makedirs(path, exist_ok=True)
+            elif member.isfile():
+                copy_stream(archive.extractfile(member), path, limits)
+
+
+# Один стиснутий файл: формат -> функція відкриття
+COMPRESSED_OPENERS = {'gz': gzip.open, 'bz2': bz2.open, 'xz': lzma.open}
+
+
+def extract_compressed(source, destination, archive_type, limits):
+    # .gz/.bz2/.xz може бути tar-архівом без .tar в імені або просто одним стиснутим файлом
+    if tarfile.is_tarfile(source):
+        extract_tar(source, destination, limits)
+        return
+    limits.add_member()
+    name = os.path.basename(source)[:-len(archive_type) - 1] or 'file'
+    with COMPRESSED_OPENERS[archive_type](source, 'rb') as member:
+        copy_stream(member, safe_path(destination, name), limits)
+
+
+def extract_archive(source, destination, archive_type, max_size=DEFAULT_MAX_SIZE, max_members=DEFAULT_MAX_MEMBERS):
+    # Розпакування одного архіву; виконується і в окремому процесі, тому лише
+    # прості аргументи. Після успіху архів видаляється, після помилки
+    # частково розпаковані файли прибираються, а архів залишається на місці.
+    limits = Limits(max_size, max_members)
+    os.makedirs(destination, exist_ok=True)
+    try:
+        if archive_type == 'zip':
+            extract_zip(source, destination, limits)
+        elif archive_type in ('tar', 'gztar', 'bztar', 'xztar'):
+            extract_tar(source, destination, limits)
+        elif archive_type in COMPRESSED_OPENERS:
+            extract_compressed(source, destination, archive_type, limits)
+        else:
+            raise ArchiveError(f"невідомий формат архіву '{archive_type}'")
+    except (ArchiveError, OSError, EOFError, lzma.LZMAError, zlib.error, zipfile.BadZipFile, tarfile.TarError,
+            NotImplementedError, RuntimeError) as e:
+        # RuntimeError - зашифрований zip, NotImplementedError - непідтримуване стиснення в zip,
+        # zlib.error - пошкоджені стиснуті дані
+        shutil.rmtree(destination, ignore_errors=True)
+        raise ArchiveError(f"Архів '{source}' пропущено: {e}") from None
+    os.remove(source)
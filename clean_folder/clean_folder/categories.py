@@ -0,0 +1,59 @@
+import json
+import os
+
+
+DEFAULT_CATEGORIES = {
+    'images': ('JPEG', 'PNG', 'JPG', 'SVG'),
+    'video': ('AVI', 'MP4', 'MOV', 'MKV'),
+    'documents': ('DOC', 'DOCX', 'PAGES', 'TXT', 'PDF', 'XLSX', 'PPTX'),
+    'audio': ('MP3', 'OGG', 'WAV', 'AMR'),
+    'archives': ('ZIP', 'GZ', 'TAR', 'TGZ', 'BZ2', 'TBZ2', 'XZ', 'TXZ'),
+}
+
+# Категорії, файли яких не переміщуються, а розпаковуються
+UNPACK_CATEGORIES = ('archives',)
+
+
+def merge_categories(categories, extra):
+    # extra: {категорія: [розширення]}; нові категорії додаються,
+    # розширення з іншої категорії переносяться в нову
+    merged = {name: list(extensions) for name, extensions in categories.items()}
+    for name, extensions in extra.items():
+        extensions = [ext.upper().lstrip('.') for ext in extensions]
+        for other in merged.values():
+            other[:] = [ext for ext in other if ext not in extensions]
+        merged.setdefault(name, []).extend(extensions)
+    return {name: tuple(extensions) for name, extensions in merged.items()}
+
+
+def load_categories(path):
+    # Конфігурація у JSON або TOML: {"categories": {"images": ["HEIC"]}}
+    if os.path.splitext(path)[1].lower() == '.toml':
+        import tomllib
+        with open(path, 'rb') as file:
+            data = tomllib.load(file)
+    else:
+        with open(path, 'r') as file:
+            data = json.load(file)
+    categories = data.get('categories', data)
+    if not isinstance(categories, dict) or not all(isinstance(v, list) for v in categories.values()):
+        raise ValueError(f"Невірний формат категорій у файлі '{path}'")
+    return categories
+
+
+def parse_extension_option(option):
+    # Аргумент CLI виду "images=HEIC,TIFF"
+    name, sep, extensions = option.partition('=')
+    if not sep or not name or not extensions:
+        raise ValueError(f"Очікується КАТЕГОРІЯ=РОЗШИРЕННЯ[,РОЗШИРЕННЯ], отримано '{option}'")
+    return {name: extensions.split(',')}
+
+
+def build_registry(categories):
+    # Реєстр: розширення -> (категорія, дія); класифікація файлу - один пошук у словнику
+    registry = {}
+    for name, extensions in categories.items():
+        action = 'unpack' if name in UNPACK_CATEGORIES else 'move'
+        for ext in extensions:
+            registry[ext] = (name, action)
+    return registry
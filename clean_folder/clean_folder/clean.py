@@ -1,102 +1,238 @@
+import argparse
+import json
 import os
-import shutil
-import re
-
-
-# Транслітерація кириличних символів на латиницю
-def normalize(text, translit_dict):
-    normalized_text = ""
-    for char in text:
-        if char.isalpha() and char.isascii():
-            normalized_text += char
-        elif char in translit_dict:
-            normalized_text += translit_dict[char]
-        else:
-            normalized_text += "_"
-
-
-    invalid_chars = r'[^\w.]' # Заміна неприпустимих символів на символ '_'
-    normalized_text = re.sub(invalid_chars, '_', normalized_text)
-
-    return normalized_text
-
-
-def process_folder(folder):
-    image_extensions = ('JPEG', 'PNG', 'JPG', 'SVG')
-    video_extensions = ('AVI', 'MP4', 'MOV', 'MKV')
-    document_extensions = ('DOC', 'DOCX', 'PAGES', 'TXT', 'PDF', 'XLSX', 'PPTX')
-    audio_extensions = ('MP3', 'OGG', 'WAV', 'AMR')
-    archive_extensions = ('ZIP', 'GZ', 'TAR')
-
-    translit_dict = {
-        'а': 'a', 'б': 'b', 'в': 'v', 'г': 'h', 'ґ': 'g',
-        'д': 'd', 'е': 'e', 'є': 'ie', 'ж': 'zh', 'з': 'z',
-        'и': 'y', 'і': 'i', 'ї': 'i', 'й': 'i', 'к': 'k',
-        'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p',
-        'р': 'r', 'с': 's', 'т': 't', 'у': 'u', 'ф': 'f',
-        'х': 'kh', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'shch',
-        'ь': '', 'ў': 'u', 'ы': 'y', 'э': 'e', 'ю': 'iu',
-        'я': 'ia', 'А': 'A', 'Б': 'B', 'В': 'V', 'Г': 'H',
-        'Ґ': 'G', 'Д': 'D', 'Е': 'E', 'Є': 'Ye', 'Ж': 'Zh',
-        'З': 'Z', 'И': 'Y', 'І': 'I', 'Ї': 'Yi', 'Й': 'Y',
-        'К': 'K', 'Л': 'L', 'М': 'M', 'Н': 'N', 'О': 'O',
-        'П': 'P', 'Р': 'R', 'С': 'S', 'Т': 'T', 'У': 'U',
-        'Ф': 'F', 'Х': 'Kh', 'Ц': 'Ts', 'Ч': 'Ch', 'Ш': 'Sh',
-        'Щ': 'Shch', 'Ь': '', 'Ў': 'U', 'Ы': 'Y', 'Э': 'E',
-        'Ю': 'Yu', 'Я': 'Ya', 
-        '1': '1', '2': '2', '3': '3', '4': '4', '5': '5', '6': '6', '7': '7', '8': '8', '9': '9', '0': '0',
-    }
-
-    known_extensions = set() #список відомих (розпізнаних) розширень файлів
-    unknown_extensions = set() #список невідомих (нерозпізнаних) розширень файлів
-
-    for root, dirs, files in os.walk(folder):
+import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext, redirect_stdout
+from itertools import islice
+from time import perf_counter_ns
+
+from clean_folder.archives import DEFAULT_MAX_MEMBERS, DEFAULT_MAX_SIZE, ArchiveError, archive_format, extract_archive
+from clean_folder.categories import DEFAULT_CATEGORIES, build_registry, load_categories, merge_categories, parse_extension_option
+from clean_folder.dedup import DEDUP_MODES, DedupIndex
+from clean_folder.manifest import IncrementalWalker, load_manifest, save_manifest
+from clean_folder.mover import Mover
+from clean_folder.scanner import EmptyDirTracker, scandir_walk
+from clean_folder.stats import RunStats
+from clean_folder.translit import normalize
+
+
+BUCKETS = tuple(DEFAULT_CATEGORIES)
+
+# Задача для виконавця: action - "move" або "unpack"
+Task = namedtuple("Task", ["action", "source", "destination", "archive_format"])
+
+
+def scan_folder(folder, walker=None, categories=DEFAULT_CATEGORIES, known_extensions=None, unknown_extensions=None, tracker=None, stats=None):
+    # Один прохід по дереву: обхід + класифікація файлів. Генератор задач, тому
+    # пам'ять не залежить від розміру дерева. destination - бажаний шлях,
+    # унікальне ім'я визначається перед виконанням (resolve_destination).
+    # walker - генератор у форматі os.walk (за замовчуванням scandir_walk(folder)),
+    # tracker - EmptyDirTracker, який рахує, що залишиться в кожній папці,
+    # stats - RunStats для заміру фаз scan/classify/normalize
+    registry = build_registry(categories)
+    buckets = tuple(categories)
+    if known_extensions is None:
+        known_extensions = set() #список відомих (розпізнаних) розширень файлів
+    if unknown_extensions is None:
+        unknown_extensions = set() #список невідомих (нерозпізнаних) розширень файлів
+
+    walk = walker if walker is not None else scandir_walk(folder)
+    if stats is not None:
+        walk = stats.timed_walk(walk)
+
+    for root, dirs, files in walk:
+        if root == folder:
+            dirs[:] = [d for d in dirs if d not in buckets] #вже розсортовані папки не чіпаємо
+        if tracker is not None:
+            tracker.listed(root, dirs, files)
+
+        # Спершу класифікація всієї папки, потім нормалізація імен - так фази
+        # заміряються один раз на папку, а не на кожен файл
+        if stats is not None:
+            start = perf_counter_ns()
+        classified = []
         for file in files:
             file_extension = file.split(".")[-1].upper() #розширення файлу
-            file_path = os.path.join(root, file) #повний шлях до файлу
-            normalized_file_name = normalize(file.split(".")[0], translit_dict) + "." + file_extension #нормалізоване ім'я файлу
 
             #розсортування файлів
-            if file_extension in image_extensions:
-                known_extensions.add(file_extension)
-                destination_folder = os.path.join(folder, "images")
-                os.makedirs(destination_folder, exist_ok=True)
-                destination_path = os.path.join(destination_folder, normalized_file_name)
-                shutil.move(file_path, destination_path)
-            elif file_extension in video_extensions:
-                known_extensions.add(file_extension)
-                destination_folder = os.path.join(folder, "video")
-                os.makedirs(destination_folder, exist_ok=True)
-                destination_path = os.path.join(destination_folder, normalized_file_name)
-                shutil.move(file_path, destination_path)
-            elif file_extension in document_extensions:
-                known_extensions.add(file_extension)
-                destination_folder = os.path.join(folder, "documents")
-                os.makedirs(destination_folder, exist_ok=True)
-                destination_path = os.path.join(destination_folder, normalized_file_name)
-                shutil.move(file_path, destination_path)
-            elif file_extension in audio_extensions:
-                known_extensions.add(file_extension)
-                destination_folder = os.path.join(folder, "audio")
-                os.makedirs(destination_folder, exist_ok=True)
-                destination_path = os.path.join(destination_folder, normalized_file_name)
-                shutil.move(file_path, destination_path)
-            elif file_extension in archive_extensions:
-                known_extensions.add(file_extension)
-                destination_folder = os.path.join(folder, "archives")
-                os.makedirs(destination_folder, exist_ok=True)
-                destination_subfolder = os.path.join(destination_folder, normalize(file.split(".")[0], translit_dict))
-                os.makedirs(destination_subfolder, exist_ok=True)
-                shutil.unpack_archive(file_path, destination_subfolder, format=file_extension.lower())
-                os.remove(file_path)
-            else:
+            category = registry.get(file_extension)
+            if category is None:
                 unknown_extensions.add(file_extension) #файли, розширення яких невідомі, залищаються без змін 
+                continue
+            known_extensions.add(file_extension)
+            classified.append((file, file_extension, category))
+        if stats is not None:
+            classified_at = perf_counter_ns()
+            stats.add("classify", classified_at - start, count=len(files))
+        if tracker is not None:
+            tracker.moved(root, len(classified))
+
+        tasks = []
+        for file, file_extension, (bucket, action) in classified:
+            file_path = os.path.join(root, file) #повний шлях до файлу
+            destination_folder = os.path.join(folder, bucket)
+            normalized_stem = normalize(file.split(".")[0]) #нормалізоване ім'я файлу
+            if action == "unpack":
+                tasks.append(Task("unpack", file_path, os.path.join(destination_folder, normalized_stem), archive_format(file)))
+            else:
+                tasks.append(Task("move", file_path, os.path.join(destination_folder, normalized_stem + "." + file_extension), None))
+        if stats is not None:
+            stats.add("normalize", perf_counter_ns() - classified_at, count=len(tasks))
+
+        yield from tasks
+
+
+def unique_destination(path, reserved, source=None):
+    # Однакові нормалізовані імена не перезаписують одне одного: name.EXT -> name_1.EXT, name_2.EXT...
+    base, extension = os.path.splitext(path)
+    candidate = path
+    counter = 0
+    while candidate in reserved or (candidate != source and os.path.exists(candidate)):
+        counter += 1
+        candidate = f"{base}_{counter}{extension}"
+    reserved.add(candidate)
+    return candidate
+
+
+def resolve_destination(task, reserved):
+    return task._replace(destination=unique_destination(task.destination, reserved, task.source))
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def execute_tasks(tasks, workers=1, batch_size=1000, skip_missing=False, on_batch=None, archive_workers=1, archive_limits=None, dedup=None, mover=None, stats=None):
+    # Задачі виконуються пачками. Унікальні імена для пачки визначаються
+    # послідовно (з урахуванням уже переміщених файлів), тому результат
+    # однаковий для будь-якої кількості потоків і розміру пачки.
+    # Розпакування архівів - окремий етап: при archive_workers > 1 архіви
+    # розпаковуються в пулі процесів паралельно з переміщеннями.
+    # dedup - DedupIndex: дублікати вже розсортованих файлів не переміщуються.
+    # mover - Mover, що виконує переміщення і рахує, яким шляхом пройшло кожне.
+    # stats - RunStats для заміру фаз dedup/move/extract.
+    # on_batch(n) викликається після кожної пачки з кількістю оброблених задач;
+    # перед цим дочікуємося всіх архівів, щоб пачка була завершена повністю.
+    archive_limits = archive_limits or (DEFAULT_MAX_SIZE, DEFAULT_MAX_MEMBERS)
+    mover = mover or Mover()
+    created = set() #папки-категорії створюються один раз за запуск
+    pool = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+    archive_pool = ProcessPoolExecutor(max_workers=archive_workers) if archive_workers > 1 else None
+    pending_archives = []
+    try:
+        for batch in batched(tasks, batch_size):
+            reserved = set()
+            ready = []
+            for task in batch:
+                if skip_missing and not os.path.exists(task.source):
+                    continue
+                task = resolve_destination(task, reserved)
+                if dedup is not None and task.action == "move":
+                    if stats is not None:
+                        start = perf_counter_ns()
+                    task = dedup.check(task)
+                    if stats is not None:
+                        stats.add("dedup", perf_counter_ns() - start)
+                    if task is None:
+                        continue
+                ready.append(task)
+            # Переміщення групуються за папкою-категорією: час міряється на групу, а не на файл
+            move_groups = {}
+            archives = []
+            for task in ready:
+                if task.action == "move":
+                    move_groups.setdefault(os.path.dirname(task.destination), []).append(task)
+                else:
+                    archives.append(task)
+            for bucket in (move_groups.keys() | {os.path.dirname(task.destination) for task in archives}) - created:
+                os.makedirs(bucket, exist_ok=True)
+                created.add(bucket)
+
+            if archive_pool is not None:
+                for task in archives:
+                    pending_archives.append(archive_pool.submit(timed_extract_archive, task.source, task.destination, task.archive_format, *archive_limits))
 
-    # Видалення порожніх папок, крім 'archives', 'video', 'audio', 'documents', 'images'
+            for bucket, group in move_groups.items():
+                start = perf_counter_ns()
+                if pool is not None:
+                    for _ in pool.map(run_task, group, [archive_limits] * len(group), [mover] * len(group)):
+                        pass
+                else:
+                    for task in group:
+                        run_task(task, archive_limits, mover)
+                if stats is not None:
+                    stats.add("move", perf_counter_ns() - start, count=len(group), category=os.path.basename(bucket))
+
+            if archive_pool is None:
+                for task in archives:
+                    start = perf_counter_ns()
+                    if run_task(task, archive_limits, mover) and stats is not None:
+                        stats.add("extract", perf_counter_ns() - start, category=os.path.basename(os.path.dirname(task.destination)))
+            mover.flush()
+
+            if dedup is not None:
+                dedup.batch_done()
+
+            if on_batch is not None:
+                wait_archives(pending_archives, stats)
+                on_batch(len(batch))
+
+        wait_archives(pending_archives, stats)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        if archive_pool is not None:
+            archive_pool.shutdown()
+
+
+def timed_extract_archive(*args):
+    # extract_archive для пулу процесів; повертає час розпакування в наносекундах
+    start = perf_counter_ns()
+    extract_archive(*args)
+    return perf_counter_ns() - start
+
+
+def wait_archives(futures, stats=None):
+    for future in futures:
+        try:
+            elapsed = future.result()
+        except ArchiveError as e:
+            print(e)
+            continue
+        if stats is not None:
+            stats.add("extract", elapsed, category="archives")
+    futures.clear()
+
+
+def run_task(task, archive_limits=None, mover=None):
+    # Виконання однієї задачі: переміщення файлу або розпакування архіву.
+    # Повертає False, якщо архів пропущено
+    if task.action == "move":
+        if task.source != task.destination:
+            (mover or Mover()).move(task.source, task.destination)
+    else:
+        try:
+            extract_archive(task.source, task.destination, task.archive_format, *(archive_limits or (DEFAULT_MAX_SIZE, DEFAULT_MAX_MEMBERS)))
+        except ArchiveError as e:
+            print(e)
+            return False
+    return True
+
+
+def remove_empty_folders(folder, buckets=BUCKETS):
+    # Видалення порожніх папок, крім 'archives', 'video', 'audio', 'documents', 'images'.
+    # Окремий обхід; process_folder натомість використовує EmptyDirTracker
     for root, dirs, files in os.walk(folder, topdown=False):
         for dir_name in dirs:
             dir_path = os.path.join(root, dir_name)
-            if dir_name not in ['archives', 'video', 'audio', 'documents', 'images'] and not os.listdir(dir_path):
+            if dir_name not in buckets and not os.listdir(dir_path):
                 os.rmdir(dir_path)
 
     # Видалення порожніх папок
@@ -106,24 +242,144 @@ def process_folder(folder):
             if not os.listdir(dir_path):
                 os.rmdir(dir_path)"""
 
+
+def process_folder(folder, workers=1, manifest_path=None, categories=DEFAULT_CATEGORIES, archive_workers=1, archive_limits=None, dedup=None, mover=None, stats=None):
+    # manifest_path вмикає інкрементальний режим: незмінені з минулого запуску
+    # папки не перечитуються, класифікуються лише нові або змінені файли
+    walker = None
+    if manifest_path:
+        manifest = load_manifest(manifest_path, folder, categories)
+        walker = IncrementalWalker(folder, manifest, skip_paths=[manifest_path])
+
+    known_extensions = set()
+    unknown_extensions = set()
+    buckets = tuple(categories)
+
+    if dedup is not None and dedup.is_new:
+        dedup.seed(buckets)
+
+    tracker = EmptyDirTracker(folder)
+    tasks = scan_folder(folder, walker, categories, known_extensions, unknown_extensions, tracker, stats)
+    execute_tasks(tasks, workers=workers, archive_workers=archive_workers, archive_limits=archive_limits, dedup=dedup, mover=mover, stats=stats)
+
+    start = perf_counter_ns()
+    tracker.sweep(buckets)
+    if stats is not None:
+        stats.add("cleanup", perf_counter_ns() - start)
+
+    if walker is not None:
+        start = perf_counter_ns()
+        registry = build_registry(categories)
+
+        def left_in_place(name):
+            return name.split(".")[-1].upper() not in registry
+
+        save_manifest(manifest_path, folder, walker.observed(left_in_place), categories)
+        if stats is not None:
+            stats.add("manifest", perf_counter_ns() - start)
+
     return known_extensions, unknown_extensions
 
 
 def main():
-    import sys
     # Код, що викликається, коли запускаєте скрипт з консолі.
+    from clean_folder.plan import apply_plan, write_plan
+    from clean_folder.watch import Watcher
+
+    parser = argparse.ArgumentParser(prog="clean-folder", description="Сортування файлів у папці за категоріями.")
+    parser.add_argument("folder", nargs="?", help="шлях до папки (для --apply за замовчуванням береться з плану)")
+    parser.add_argument("--workers", type=int, default=1, help="кількість паралельних потоків для переміщень і розпакування")
+    parser.add_argument("--manifest", metavar="PATH", help="файл маніфесту для інкрементального режиму")
+    parser.add_argument("--config", metavar="PATH", help="JSON або TOML файл з додатковими категоріями")
+    parser.add_argument("--ext", action="append", default=[], metavar="КАТЕГОРІЯ=РОЗШ[,РОЗШ]", help="додати розширення до категорії (можна повторювати)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--plan", metavar="PLAN", help="лише скласти план переміщень у файл, нічого не змінюючи")
+    mode.add_argument("--apply", metavar="PLAN", help="виконати раніше складений план (можна продовжити після переривання)")
+    mode.add_argument("--watch", action="store_true", help="стежити за папкою (inotify) і сортувати нові файли одразу")
+    parser.add_argument("--debounce", type=float, default=0.2, metavar="SEC", help="пауза без нових подій перед сортуванням пачки у --watch")
+    parser.add_argument("--archive-workers", type=int, default=1, help="кількість процесів для розпакування архівів")
+    parser.add_argument("--archive-max-size", type=int, default=DEFAULT_MAX_SIZE // 1024 ** 2, metavar="MB", help="максимальний розпакований розмір одного архіву")
+    parser.add_argument("--archive-max-members", type=int, default=DEFAULT_MAX_MEMBERS, help="максимальна кількість файлів в одному архіві")
+    parser.add_argument("--dedup-index", metavar="PATH", help="файл індексу дублікатів (зберігається між запусками)")
+    parser.add_argument("--dedup", choices=DEDUP_MODES, default="link", help="що робити з дублікатами: link - жорстке посилання, skip - залишити на місці")
+    parser.add_argument("--fsync", action="store_true", help="надійний режим: один sync на пачку перед видаленням скопійованих з іншого диска файлів")
+    parser.add_argument("--stats", choices=("text", "json"), help="звіт про час і кількість для кожної фази і категорії")
+    parser.add_argument("--progress", action="store_true", help="живий рядок прогресу в stderr")
+    parser.add_argument("--batch-size", type=int, default=1000, help="розмір пачки задач для --apply")
+    args = parser.parse_args()
 
-    if len(sys.argv) != 2:
-        print("Usage: python3 clean.py <Потрібно вказати шлях до папки.>")
-        sys.exit(1)
+    if args.workers < 1 or args.archive_workers < 1:
+        parser.error("--workers і --archive-workers мають бути не менше 1")
+    if args.folder is None and not args.apply:
+        parser.error("потрібно вказати шлях до папки")
+    if args.manifest and (args.plan or args.apply or args.watch):
+        parser.error("--manifest не поєднується з --plan/--apply/--watch")
 
-    target_folder = sys.argv[1]
-    known_extensions, unknown_extensions = process_folder(target_folder)
+    categories = DEFAULT_CATEGORIES
+    try:
+        if args.config:
+            categories = merge_categories(categories, load_categories(args.config))
+        for option in args.ext:
+            categories = merge_categories(categories, parse_extension_option(option))
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    archive_limits = (args.archive_max_size * 1024 ** 2, args.archive_max_members)
+    mover = Mover(durable=args.fsync)
+    stats = RunStats(progress=args.progress) if args.stats or args.progress else None
+
+    # --stats json: у stdout лише звіт JSON (разом із переміщеннями й розширеннями),
+    # решта повідомлень під час роботи - у stderr
+    dedup = None
+    with redirect_stdout(sys.stderr) if args.stats == "json" else nullcontext():
+        if args.plan:
+            known_extensions, unknown_extensions = write_plan(args.folder, args.plan, categories, stats=stats)
+        elif args.apply:
+            known_extensions, unknown_extensions = apply_plan(
+                args.apply, args.folder, workers=args.workers, batch_size=args.batch_size,
+                archive_workers=args.archive_workers, archive_limits=archive_limits, mover=mover, stats=stats,
+            )
+        else:
+            dedup = DedupIndex(args.dedup_index, args.folder, args.dedup) if args.dedup_index else None
+            try:
+                if args.watch:
+                    watcher = Watcher(
+                        args.folder, categories, debounce=args.debounce, workers=args.workers,
+                        archive_workers=args.archive_workers, archive_limits=archive_limits, dedup=dedup, mover=mover, stats=stats,
+                    )
+                    try:
+                        watcher.run()
+                    except KeyboardInterrupt:
+                        return
+                known_extensions, unknown_extensions = process_folder(
+                    args.folder, workers=args.workers, manifest_path=args.manifest, categories=categories,
+                    archive_workers=args.archive_workers, archive_limits=archive_limits, dedup=dedup, mover=mover, stats=stats,
+                )
+            finally:
+                if dedup is not None:
+                    dedup.close()
+            if dedup is not None:
+                print("Duplicates:", len(dedup.duplicates))
+                for source, existing in dedup.collisions:
+                    print(f"Колізія хешу: '{source}' і '{existing}' мають різний вміст")
 
+    if stats is not None:
+        stats.finish()
+    if args.stats == "json":
+        report = stats.report()
+        report["moves"] = mover.stats
+        report["known_extensions"] = sorted(known_extensions)
+        report["unknown_extensions"] = sorted(unknown_extensions)
+        if dedup is not None:
+            report["duplicates"] = len(dedup.duplicates)
+        print(json.dumps(report))
+        return
+    if args.stats == "text":
+        print(stats.format_text())
+    print("Moves:", mover.stats)
     print("Known Extensions:", known_extensions)
     print("Unknown Extensions:", unknown_extensions)
 
 
 if __name__ == "__main__":
     main()
-    
\ No newline at end of file
@@ -0,0 +1,106 @@
+import filecmp
+import hashlib
+import os
+import sqlite3
+
+
+DEDUP_MODES = ('link', 'skip')
+
+
+def file_hash(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as file:
+        while chunk := file.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DedupIndex:
+    # Індекс уже розсортованих файлів між запусками (SQLite).
+    # Спершу порівнюється розмір; хеш рахується лише тоді, коли з'являється
+    # другий файл того ж розміру (для старого запису - теж лише тоді).
+    # Кожна перевірка - кілька пошуків за індексом, без перегляду папок.
+    # mode: 'link' - дублікат стає жорстким посиланням на наявну копію,
+    #       'skip' - дублікат залишається на місці і не переміщується.
+    def __init__(self, path, folder, mode='link'):
+        if mode not in DEDUP_MODES:
+            raise ValueError(f"Невідомий режим дедуплікації '{mode}'")
+        self.folder = folder
+        self.mode = mode
+        self.duplicates = [] #(дублікат, наявна копія)
+        self.collisions = [] #однаковий розмір і хеш, але різний вміст
+        self.pending = {} #призначення -> джерело для файлів, ще не переміщених у поточній пачці
+        self.is_new = not os.path.exists(path)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, size INTEGER NOT NULL, hash TEXT)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS files_size_hash ON files (size, hash)")
+
+    def seed(self, buckets):
+        # Перший запуск: додаємо до індексу файли, що вже лежать у папках-категоріях (лише розміри)
+        for bucket in buckets:
+            for root, dirs, files in os.walk(os.path.join(self.folder, bucket)):
+                for file in files:
+                    path = os.path.join(root, file)
+                    self.add(path, os.path.getsize(path))
+        self.connection.commit()
+
+    def add(self, path, size, hash_value=None):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO files (path, size, hash) VALUES (?, ?, ?)",
+            (os.path.relpath(path, self.folder), size, hash_value),
+        )
+
+    def find_duplicate(self, source, size):
+        # Повертає (наявна копія або None, хеш джерела або None)
+        rows = self.connection.execute("SELECT path, hash FROM files WHERE size = ?", (size,)).fetchall()
+        if not rows:
+            return None, None
+
+        source_hash = file_hash(source)
+        for relative_path, hash_value in rows:
+            path = self.pending.get(os.path.join(self.folder, relative_path), os.path.join(self.folder, relative_path))
+            if not os.path.exists(path):
+                self.connection.execute("DELETE FROM files WHERE path = ?", (relative_path,))
+                continue
+            if hash_value is None:
+                hash_value = file_hash(path)
+                self.connection.execute("UPDATE files SET hash = ? WHERE path = ?", (hash_value, relative_path))
+            if hash_value != source_hash:
+                continue
+            if filecmp.cmp(source, path, shallow=False):
+                return path, source_hash
+            self.collisions.append((source, path))
+        return None, source_hash
+
+    def check(self, task):
+        # Повертає задачу для виконання або None, якщо дублікат уже оброблено тут
+        size = os.path.getsize(task.source)
+        existing, source_hash = self.find_duplicate(task.source, size)
+
+        if existing is None:
+            self.add(task.destination, size, source_hash)
+            self.pending[task.destination] = task.source
+            return task
+
+        if self.mode == 'link':
+            os.makedirs(os.path.dirname(task.destination), exist_ok=True)
+            try:
+                os.link(existing, task.destination)
+            except OSError:
+                # Копія на іншому диску (EXDEV; для файлу з цієї ж пачки existing - ще
+                # його джерело) або ФС без жорстких посилань - переміщуємо як звичайний файл
+                self.add(task.destination, size, source_hash)
+                self.pending[task.destination] = task.source
+                return task
+            os.remove(task.source)
+            self.add(task.destination, size, source_hash)
+        self.duplicates.append((task.source, existing))
+        return None
+
+    def batch_done(self):
+        self.pending.clear()
+        self.connection.commit()
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
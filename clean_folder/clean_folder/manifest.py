@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import time
+
+
+MANIFEST_VERSION = 1
+
+
+# Маніфест: для кожної папки (шлях відносно цільової папки) зберігаються
+# підпис (mtime_ns, inode), список підпапок і файли, що залишились на місці
+# після сортування: {name: [size, mtime_ns, inode]}.
+# У заголовку - хеш категорій, з якими сортувались файли: після зміни --config/--ext
+# файли, що лишились на місці, могли стати відомими, тож маніфест не використовується
+def categories_hash(categories):
+    data = json.dumps({name: sorted(extensions) for name, extensions in categories.items()}, sort_keys=True)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def load_manifest(path, folder, categories):
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r") as file:
+            data = json.load(file)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if data.get("version") != MANIFEST_VERSION or data.get("folder") != os.path.abspath(folder):
+        return {}
+    if data.get("categories") != categories_hash(categories):
+        return {}
+    return data.get("dirs", {})
+
+
+def save_manifest(path, folder, dirs, categories):
+    temp_path = path + ".tmp"
+    header = {"version": MANIFEST_VERSION, "folder": os.path.abspath(folder), "categories": categories_hash(categories)}
+    with open(temp_path, "w") as file:
+        json.dump({**header, "dirs": dirs}, file)
+    os.replace(temp_path, path)
+
+
+def dir_signature(stat_result):
+    return [stat_result.st_mtime_ns, stat_result.st_ino]
+
+
+def file_signature(stat_result):
+    return [stat_result.st_size, stat_result.st_mtime_ns, stat_result.st_ino]
+
+
+class IncrementalWalker:
+    # Обхід у стилі os.walk(topdown=True), який не перечитує незмінені папки.
+    # Зміна набору записів у папці змінює її mtime, тому для папки з тим самим
+    # підписом беремо список підпапок з маніфесту і не віддаємо жодного файлу.
+    # У змінених папках віддаються лише нові або змінені файли.
+    # Новий маніфест (observed) будується з того, що обхід побачив: підпис папки
+    # знято до читання, тож файл, що з'явився під час запуску, змінює mtime і папка
+    # перечитується наступного разу, а не записується як "залишений на місці".
+    # Межі: mtime має грубу точність (1-2 с на FAT, NFS з кешем атрибутів бачить
+    # зміни із затримкою acdirmin/acdirmax), тож файл, доданий у тому ж "тіку" після
+    # читання, не змінить підпис. Папку, змінену менше ніж RACY_NS тому, не вважаємо
+    # незмінною (підпис не зберігається); кеш атрибутів NFS це не покриває - для
+    # таких шар періодично потрібен повний запуск без --manifest.
+    RACY_NS = 2 * 10**9
+
+    def __init__(self, folder, manifest, skip_paths=()):
+        self.folder = folder
+        self.manifest = manifest
+        self.skip_paths = {os.path.abspath(p) for p in skip_paths}
+        self.seen = {}
+
+    def relative(self, path):
+        return os.path.relpath(path, self.folder)
+
+    def __iter__(self):
+        stack = [self.folder]
+        while stack:
+            root = stack.pop()
+            try:
+                stat_result = os.stat(root)
+            except OSError:
+                continue
+            signature = dir_signature(stat_result)
+            key = self.relative(root)
+            entry = self.manifest.get(key)
+
+            if entry and entry["signature"] == signature:
+                dirs = list(entry["dirs"])
+                files = []
+                seen_files = entry["files"]
+            else:
+                known_files = entry["files"] if entry else {}
+                dirs, files, seen_files = [], [], {}
+                with os.scandir(root) as entries:
+                    for dir_entry in entries:
+                        if dir_entry.is_dir(follow_symlinks=False):
+                            dirs.append(dir_entry.name)
+                        elif os.path.abspath(dir_entry.path) in self.skip_paths:
+                            continue
+                        else:
+                            seen_files[dir_entry.name] = file_signature(dir_entry.stat(follow_symlinks=False))
+                            if known_files.get(dir_entry.name) != seen_files[dir_entry.name]:
+                                files.append(dir_entry.name)
+                if time.time_ns() - stat_result.st_mtime_ns < self.RACY_NS:
+                    signature = None
+
+            yield root, dirs, files
+            # dirs - після того, як споживач відкинув непотрібні (напр. папки категорій)
+            self.seen[key] = {"signature": signature, "dirs": list(dirs), "files": seen_files}
+            stack.extend(os.path.join(root, d) for d in reversed(dirs))
+
+    def observed(self, left_in_place):
+        # Маніфест після запуску: лише пройдені папки і лише ті побачені файли,
+        # для яких left_in_place(ім'я) - ті, що сортування не переміщує
+        return {
+            key: {
+                "signature": entry["signature"],
+                "dirs": entry["dirs"],
+                "files": {name: signature for name, signature in entry["files"].items() if left_in_place(name)},
+            }
+            for key, entry in self.seen.items()
+        }
@@ -0,0 +1,121 @@
+import json
+import os
+import uuid
+
+from clean_folder.clean import BUCKETS, Task, execute_tasks, remove_empty_folders, scan_folder
+from clean_folder.categories import DEFAULT_CATEGORIES
+
+
+PLAN_VERSION = 1
+
+
+# План - файл JSON Lines:
+#   перший рядок - заголовок {"plan": 1, "id": "...", "folder": "/abs/path", "buckets": [...]}
+#   далі по рядку на задачу {"action": ..., "source": ..., "destination": ..., "format": ...}
+#   останній рядок - підсумок {"known": [...], "unknown": [...]}
+# Шляхи в задачах відносні до цільової папки, тож план можна застосувати
+# на іншій машині, де ця папка змонтована в іншому місці.
+# id - випадковий ідентифікатор плану; <план>.progress дійсний лише для плану з тим самим id,
+# тож новий план у тому ж файлі виконується з початку
+def write_plan(folder, plan_path, categories=DEFAULT_CATEGORIES, stats=None):
+    known_extensions = set()
+    unknown_extensions = set()
+    remove_progress(plan_path + ".progress")
+    with open(plan_path, "w") as file:
+        header = {"plan": PLAN_VERSION, "id": uuid.uuid4().hex, "folder": os.path.abspath(folder), "buckets": list(categories)}
+        file.write(json.dumps(header) + "\n")
+        for task in scan_folder(folder, None, categories, known_extensions, unknown_extensions, stats=stats):
+            line = {
+                "action": task.action,
+                "source": os.path.relpath(task.source, folder),
+                "destination": os.path.relpath(task.destination, folder),
+                "format": task.archive_format,
+            }
+            file.write(json.dumps(line, ensure_ascii=False) + "\n")
+        file.write(json.dumps({"known": sorted(known_extensions), "unknown": sorted(unknown_extensions)}) + "\n")
+    return known_extensions, unknown_extensions
+
+
+def read_plan_header(plan_path):
+    with open(plan_path, "r") as file:
+        header = json.loads(file.readline())
+    if header.get("plan") != PLAN_VERSION:
+        raise ValueError(f"Файл '{plan_path}' не є планом clean-folder")
+    return header
+
+
+def read_plan_tasks(plan_path, folder, summary):
+    # Генератор задач з плану; підсумок (known/unknown) записується в summary
+    with open(plan_path, "r") as file:
+        file.readline()
+        for line in file:
+            data = json.loads(line)
+            if "action" not in data:
+                summary.update(data)
+                continue
+            yield Task(
+                data["action"],
+                os.path.join(folder, data["source"]),
+                os.path.join(folder, data["destination"]),
+                data["format"],
+            )
+
+
+def read_progress(progress_path, plan_id):
+    # Кількість виконаних задач; прогрес іншого плану (або без id) - 0
+    try:
+        with open(progress_path, "r") as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return 0
+    if not isinstance(data, dict) or plan_id is None or data.get("plan") != plan_id:
+        return 0
+    return data.get("done", 0)
+
+
+def write_progress(progress_path, plan_id, done):
+    temp_path = progress_path + ".tmp"
+    with open(temp_path, "w") as file:
+        json.dump({"plan": plan_id, "done": done}, file)
+    os.replace(temp_path, progress_path)
+
+
+def remove_progress(progress_path):
+    try:
+        os.remove(progress_path)
+    except FileNotFoundError:
+        pass
+
+
+def apply_plan(plan_path, folder=None, workers=1, batch_size=1000, archive_workers=1, archive_limits=None, mover=None, stats=None):
+    # Виконання плану пачками. Після кожної пачки кількість виконаних задач
+    # записується у <план>.progress, тож перерваний запуск продовжується з
+    # останньої завершеної пачки; задачі, джерело яких вже зникло, пропускаються.
+    # Після повного виконання файл прогресу видаляється.
+    header = read_plan_header(plan_path)
+    folder = folder or header["folder"]
+    buckets = tuple(header.get("buckets", BUCKETS))
+    progress_path = plan_path + ".progress"
+    plan_id = header.get("id")
+    done = read_progress(progress_path, plan_id)
+
+    summary = {}
+
+    def pending_tasks():
+        for index, task in enumerate(read_plan_tasks(plan_path, folder, summary)):
+            if index >= done:
+                yield task
+
+    def on_batch(count):
+        nonlocal done
+        done += count
+        write_progress(progress_path, plan_id, done)
+
+    execute_tasks(
+        pending_tasks(), workers=workers, batch_size=batch_size, skip_missing=True, on_batch=on_batch,
+        archive_workers=archive_workers, archive_limits=archive_limits, mover=mover, stats=stats,
+    )
+    remove_progress(progress_path)
+    remove_empty_folders(folder, buckets=buckets)
+
+    return set(summary.get("known", [])), set(summary.get("unknown", []))
@@ -0,0 +1,72 @@
+import os
+
+
+def scandir_walk(folder):
+    # Обхід у форматі os.walk(topdown=True) на os.scandir: тип запису береться
+    # з DirEntry (d_type), без окремого stat. Зміни в dirs враховуються, як в os.walk.
+    # Посилання на папки потрапляють у dirs, але всередину обхід не заходить.
+    stack = [folder]
+    while stack:
+        root = stack.pop()
+        dirs, files, links = [], [], set()
+        try:
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        dirs.append(entry.name)
+                        if entry.is_symlink():
+                            links.add(entry.name)
+                    else:
+                        files.append(entry.name)
+        except OSError:
+            continue
+
+        yield root, dirs, files
+        stack.extend(os.path.join(root, d) for d in reversed(dirs) if d not in links)
+
+
+class EmptyDirTracker:
+    # Лічильник записів, що залишаться в кожній переглянутій папці після сортування.
+    # scan_folder повідомляє про кожен файл, що буде переміщений; після виконання
+    # задач папки з нулем записів видаляються знизу вгору без повторного обходу
+    # і без os.listdir. Якщо лічильник помилився (архів не розпакувався, дублікат
+    # залишено на місці), os.rmdir просто не видалить непорожню папку.
+    def __init__(self, folder):
+        self.folder = os.path.normpath(folder)
+        self.remaining = {}
+        self.order = []
+
+    def listed(self, root, dirs, files):
+        root = os.path.normpath(root)
+        self.remaining[root] = len(dirs) + len(files)
+        self.order.append(root)
+
+    def moved(self, root, count=1):
+        self.remaining[os.path.normpath(root)] -= count
+
+    def sweep(self, buckets):
+        # Зворотний порядок обходу в глибину: дочірні папки раніше за батьківські
+        for dir_path in reversed(self.order):
+            if dir_path == self.folder or self.remaining[dir_path] > 0:
+                continue
+            if os.path.basename(dir_path) in buckets:
+                continue
+            try:
+                os.rmdir(dir_path)
+            except OSError:
+                continue
+            self.removed(os.path.dirname(dir_path), buckets)
+
+    def removed(self, parent, buckets):
+        # Папку в parent видалено. Відома папка чекає своєї черги в sweep; невідомої
+        # (пачка --watch бачить лише папки нових файлів, а не їхніх батьків) обхід
+        # не бачив, тож вона видаляється тут, якщо спорожніла, і далі вгору - не вище folder
+        while parent not in self.remaining:
+            if not parent.startswith(self.folder + os.sep) or os.path.basename(parent) in buckets:
+                return
+            try:
+                os.rmdir(parent)
+            except OSError:
+                return
+            parent = os.path.dirname(parent)
+        self.remaining[parent] -= 1
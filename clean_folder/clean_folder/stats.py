@@ -0,0 +1,78 @@
+import sys
+import time
+
+
+PHASES = ("scan", "classify", "normalize", "dedup", "move", "extract", "cleanup", "manifest")
+
+
+class RunStats:
+    # Лічильники і час (у наносекундах) для кожної фази і кожної категорії.
+    # Заміри робляться на папку (scan/classify/normalize) і на групу переміщень
+    # у пачці (move), а не на кожен файл, тож накладні витрати мізерні.
+    # Усі виклики - з основного потоку, блокування не потрібне.
+    # progress=True виводить живий рядок прогресу в stderr не частіше ніж раз на interval секунд.
+    def __init__(self, progress=False, interval=0.5, stream=sys.stderr):
+        self.phases = {phase: [0, 0] for phase in PHASES} #фаза -> [кількість, нс]
+        self.categories = {} #категорія -> [кількість, нс переміщення/розпакування]
+        self.started = time.perf_counter_ns()
+        self.progress = progress
+        self.interval_ns = int(interval * 1e9)
+        self.next_progress = self.started
+        self.stream = stream
+
+    def add(self, phase, elapsed_ns, count=1, category=None):
+        counters = self.phases[phase]
+        counters[0] += count
+        counters[1] += elapsed_ns
+        if category is not None:
+            counters = self.categories.setdefault(category, [0, 0])
+            counters[0] += count
+            counters[1] += elapsed_ns
+        if self.progress:
+            self.show_progress()
+
+    def timed_walk(self, walker):
+        # Обгортка над walker: час, витрачений у самому обході (між next())
+        iterator = iter(walker)
+        while True:
+            start = time.perf_counter_ns()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add("scan", time.perf_counter_ns() - start, count=0)
+                return
+            self.add("scan", time.perf_counter_ns() - start)
+            yield item
+
+    def show_progress(self, final=False):
+        now = time.perf_counter_ns()
+        if not final and now < self.next_progress:
+            return
+        self.next_progress = now + self.interval_ns
+        line = (
+            f"\r[clean-folder] папок: {self.phases['scan'][0]}, файлів: {self.phases['classify'][0]}, "
+            f"переміщено: {self.phases['move'][0]}, архівів: {self.phases['extract'][0]}, "
+            f"{(now - self.started) / 1e9:.1f} с"
+        )
+        self.stream.write(line + ("\n" if final else ""))
+        self.stream.flush()
+
+    def finish(self):
+        if self.progress:
+            self.show_progress(final=True)
+
+    def report(self):
+        return {
+            "elapsed": (time.perf_counter_ns() - self.started) / 1e9,
+            "phases": {phase: {"count": count, "seconds": ns / 1e9} for phase, (count, ns) in self.phases.items()},
+            "categories": {name: {"count": count, "seconds": ns / 1e9} for name, (count, ns) in self.categories.items()},
+        }
+
+    def format_text(self):
+        report = self.report()
+        lines = [f"Elapsed: {report['elapsed']:.3f} s"]
+        for phase, data in report["phases"].items():
+            lines.append(f"  {phase:<10} {data['count']:>10} {data['seconds']:>10.3f} s")
+        for name, data in sorted(report["categories"].items()):
+            lines.append(f"  [{name}] {data['count']} файлів, {data['seconds']:.3f} s")
+        return "\n".join(lines)
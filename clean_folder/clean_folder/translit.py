@@ -0,0 +1,63 @@
+import re
+from functools import lru_cache
+
+
+TRANSLIT_DICT = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'h', 'ґ': 'g',
+    'д': 'd', 'е': 'e', 'є': 'ie', 'ж': 'zh', 'з': 'z',
+    'и': 'y', 'і': 'i', 'ї': 'i', 'й': 'i', 'к': 'k',
+    'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p',
+    'р': 'r', 'с': 's', 'т': 't', 'у': 'u', 'ф': 'f',
+    'х': 'kh', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'shch',
+    'ь': '', 'ў': 'u', 'ы': 'y', 'э': 'e', 'ю': 'iu',
+    'я': 'ia', 'А': 'A', 'Б': 'B', 'В': 'V', 'Г': 'H',
+    'Ґ': 'G', 'Д': 'D', 'Е': 'E', 'Є': 'Ye', 'Ж': 'Zh',
+    'З': 'Z', 'И': 'Y', 'І': 'I', 'Ї': 'Yi', 'Й': 'Y',
+    'К': 'K', 'Л': 'L', 'М': 'M', 'Н': 'N', 'О': 'O',
+    'П': 'P', 'Р': 'R', 'С': 'S', 'Т': 'T', 'У': 'U',
+    'Ф': 'F', 'Х': 'Kh', 'Ц': 'Ts', 'Ч': 'Ch', 'Ш': 'Sh',
+    'Щ': 'Shch', 'Ь': '', 'Ў': 'U', 'Ы': 'Y', 'Э': 'E',
+    'Ю': 'Yu', 'Я': 'Ya',
+    '1': '1', '2': '2', '3': '3', '4': '4', '5': '5', '6': '6', '7': '7', '8': '8', '9': '9', '0': '0',
+}
+
+ASCII_LETTERS = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+class TranslitTable(dict):
+    # Таблиця для str.translate: символ, якого немає в таблиці, замінюється на '_'
+    # і запам'ятовується, тож наступного разу це теж один пошук у словнику
+    def __missing__(self, key):
+        self[key] = '_'
+        return '_'
+
+
+class Transliterator:
+    # Таблиця транслітерації будується один раз, далі normalize - це один str.translate.
+    # Латинські літери залишаються, символи зі словника транслітеруються,
+    # усе інше (пробіли, крапки, цифри не зі словника, інші алфавіти) стає '_'.
+    # Ключ '_' у словнику ігнорується: '_' - це заміна для невідомих символів.
+    invalid_chars = re.compile(r'[^\w.]')
+
+    def __init__(self, translit_dict=TRANSLIT_DICT, cache_size=65536):
+        self.table = TranslitTable({ord(char): char for char in ASCII_LETTERS})
+        for char, value in translit_dict.items():
+            if len(char) == 1 and char not in ASCII_LETTERS and char != '_':
+                self.table[ord(char)] = self.invalid_chars.sub('_', value)
+        self.normalize = lru_cache(maxsize=cache_size)(self._normalize)
+
+    def _normalize(self, text):
+        return text.translate(self.table)
+
+    def __call__(self, text):
+        return self.normalize(text)
+
+
+DEFAULT_TRANSLITERATOR = Transliterator()
+
+
+# Транслітерація кириличних символів на латиницю
+def normalize(text, translit_dict=None):
+    if translit_dict is None or translit_dict is TRANSLIT_DICT:
+        return DEFAULT_TRANSLITERATOR(text)
+    return Transliterator(translit_dict, cache_size=0)(text)
@@ -0,0 +1,160 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+from clean_folder.categories import DEFAULT_CATEGORIES
+from clean_folder.clean import execute_tasks, process_folder, scan_folder
+from clean_folder.scanner import EmptyDirTracker, scandir_walk
+
+
+# Константи з <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class Inotify:
+    # Мінімальна обгортка над inotify з libc через ctypes
+    def __init__(self):
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.paths = {} #дескриптор спостереження -> шлях папки
+
+    def add_watch(self, path):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for '{path}'")
+        self.paths[wd] = path
+
+    def read_events(self):
+        # Повертає список (шлях папки, ім'я, маска)
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & IN_IGNORED:
+                self.paths.pop(wd, None)
+                continue
+            events.append((self.paths.get(wd), name, mask))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+def batch_walker(paths):
+    # Walker для scan_folder лише з файлів пачки: (папка, [], [файли]).
+    # Папки за шляхом: батьківська раніше за вкладені, як в обході в глибину, -
+    # EmptyDirTracker.sweep прибирає вкладені першими
+    by_dir = {}
+    for path in paths:
+        by_dir.setdefault(os.path.dirname(path), []).append(os.path.basename(path))
+    for root in sorted(by_dir):
+        yield root, [], by_dir[root]
+
+
+class Watcher:
+    # clean-folder --watch: нові файли (закриті після запису або переміщені в
+    # папку) збираються в чергу; коли протягом debounce секунд подій немає
+    # (або черга досягла max_batch), пачка сортується тим самим scan_folder/
+    # execute_tasks, що й process_folder. Без подій процес блокується в poll.
+    def __init__(self, folder, categories=DEFAULT_CATEGORIES, debounce=0.2, max_delay=1.0, max_batch=1000, **options):
+        self.folder = folder
+        self.categories = categories
+        self.buckets = tuple(categories)
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self.options = options #workers, archive_workers, archive_limits, dedup
+        self.inotify = Inotify()
+        self.queue = {} #шлях -> None, зберігає порядок і прибирає повтори
+
+    def watch_tree(self, path, queue_files=True):
+        # Спостереження за папкою і всіма підпапками; файли, що вже там є, стають у чергу
+        for root, dirs, files in scandir_walk(path):
+            if root == self.folder:
+                dirs[:] = [d for d in dirs if d not in self.buckets]
+            self.inotify.add_watch(root)
+            if queue_files:
+                for file in files:
+                    self.queue[os.path.join(root, file)] = None
+
+    def handle(self, events):
+        for directory, name, mask in events:
+            if mask & IN_Q_OVERFLOW:
+                # Черга ядра переповнилась - події втрачено, тож повний прохід
+                self.queue.clear()
+                self.run_full()
+                continue
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and not (directory == self.folder and name in self.buckets):
+                    self.watch_tree(path)
+            elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                self.queue[path] = None
+
+    def run_full(self):
+        known_extensions, unknown_extensions = process_folder(self.folder, categories=self.categories, **self.options)
+        print("Known Extensions:", known_extensions)
+        print("Unknown Extensions:", unknown_extensions)
+
+    def flush(self):
+        paths = list(self.queue)
+        self.queue.clear()
+        known_extensions = set()
+        tracker = EmptyDirTracker(self.folder)
+        tasks = scan_folder(self.folder, batch_walker(paths), self.categories, known_extensions, None, tracker, self.options.get("stats"))
+        execute_tasks(tasks, skip_missing=True, **self.options)
+        tracker.sweep(self.buckets)
+        if known_extensions:
+            print(f"Розсортовано файлів: {len(paths)} ({', '.join(sorted(known_extensions))})")
+
+    def run(self):
+        # Спершу спостереження, потім повний прохід - файли, що з'являться між ними, не загубляться
+        self.watch_tree(self.folder, queue_files=False)
+        self.run_full()
+        poller = select.poll()
+        poller.register(self.inotify.fd, select.POLLIN)
+        try:
+            while True:
+                if not self.queue:
+                    poller.poll() #очікування без таймауту - процес простоює
+                    self.handle(self.inotify.read_events())
+                    continue
+                # Пачка закривається після debounce секунд тиші, але не пізніше
+                # max_delay від першої події, щоб безперервний потік не відкладав сортування
+                limit = time.monotonic() + self.max_delay
+                deadline = time.monotonic() + self.debounce
+                while self.queue and len(self.queue) < self.max_batch:
+                    timeout = min(deadline, limit) - time.monotonic()
+                    if timeout <= 0 or not poller.poll(timeout * 1000):
+                        break
+                    self.handle(self.inotify.read_events())
+                    deadline = time.monotonic() + self.debounce
+                if self.queue:
+                    self.flush()
+        finally:
+            self.inotify.close()
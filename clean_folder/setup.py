@@ -6,6 +6,6 @@ setup(
     description='Very useful code',
     url='https://github.com/Dmytro9513/first.git',
     author='Dimasta',
-    packages=find_namespace_packages(),
+    packages=find_namespace_packages(include=['clean_folder', 'clean_folder.*']),
     entry_points={'console_scripts': ['clean-folder = clean_folder.clean:main']}
 )